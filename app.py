@@ -3,19 +3,48 @@ Smart Resume Screener - Main Application
 Flask API for resume parsing, skill extraction, and job matching
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Request, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
+import hashlib
+import json
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from services.resume_parser import ResumeParser
 # Using mock services for demo (no OpenAI API calls)
 from services.data_extractor_mock import DataExtractor
 from services.job_matcher_mock import JobMatcher
+from services.job_matcher import JobMatcher as LLMJobMatcher
+from services.job_matcher_vector import JobMatcher as VectorJobMatcher
+from services.cascade_matcher import CascadeMatcher
+from services import resume_ingest
+from services.resume_features import FEATURE_VERSION, build_resume_features
+from services.job_profile import JobProfileCache, job_profile_key
+from services.job_results_cache import JobResultsCache
+from services.process_pool import ProcessPool
+from services.llm_cache import get_llm_cache
+from services.skill_matcher import SkillMatcher
+from services.text_vectorizer import vectorize
 from database.db_manager import DatabaseManager
+from config import Config
+
+
+class UploadRequest(Request):
+    """Request that accepts larger bodies on the bulk upload route only"""
+    
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'upload_resumes':
+            return Config.MAX_BULK_UPLOAD_SIZE
+        return super().max_content_length
+
 
 app = Flask(__name__, static_folder='frontend')
+app.request_class = UploadRequest
 # Allow CORS for all domains on all routes, including credentials
 CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
 
@@ -34,7 +63,7 @@ def add_cors_headers(response):
 UPLOAD_FOLDER = os.path.join(app.root_path, 'uploads', 'resumes')
 ALLOWED_EXTENSIONS = {'pdf', 'txt'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_CONTENT_LENGTH'] = Config.MAX_FILE_SIZE  # Bulk uploads get MAX_BULK_UPLOAD_SIZE
 
 # Ensure upload directory exists (absolute path)
 Path(UPLOAD_FOLDER).mkdir(parents=True, exist_ok=True)
@@ -43,7 +72,41 @@ Path(UPLOAD_FOLDER).mkdir(parents=True, exist_ok=True)
 db_manager = DatabaseManager()
 resume_parser = ResumeParser()
 data_extractor = DataExtractor()
-job_matcher = JobMatcher()
+# Matcher backend selected by JOB_MATCHER
+MATCHERS = {
+    'keyword': JobMatcher,
+    'vector': lambda: VectorJobMatcher(db_manager.vectors),
+    'llm': lambda: LLMJobMatcher(db_manager.get_resume_texts)
+}
+job_matcher = MATCHERS[Config.JOB_MATCHER]()
+
+# Keyword heuristic scoring the whole pool in cascade mode, whatever the backend
+keyword_matcher = job_matcher if isinstance(job_matcher, JobMatcher) else JobMatcher()
+
+# LLM matcher for cascade mode, created on first use (needs OPENAI_API_KEY)
+llm_matcher = None
+
+# Matcher for the skill index vocabulary, as (vocabulary, SkillMatcher)
+skill_index_matcher = None
+
+# Recently compiled job description profiles
+job_profiles = JobProfileCache(Config.JOB_PROFILE_CACHE_SIZE)
+
+# Recently read pages of stored job results
+job_results = JobResultsCache(Config.JOB_RESULTS_CACHE_SIZE)
+
+# Process pool for bulk resume parsing, started on first use
+ingest_pool = ProcessPool(
+    max_workers=Config.INGEST_MAX_WORKERS,
+    initializer=resume_ingest.init_worker,
+    initargs=(DataExtractor,)
+)
+
+# Background writer for persisting original uploads
+upload_writer = ThreadPoolExecutor(max_workers=1)
+
+# Background workers for asynchronous match jobs
+match_executor = ThreadPoolExecutor(max_workers=Config.MATCH_JOB_WORKERS)
 
 
 def allowed_file(filename):
@@ -51,6 +114,473 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def find_job_skills(job_description):
+    """
+    Find indexed candidate skills mentioned in a job description
+    
+    Args:
+        job_description: Job description text
+        
+    Returns:
+        List of normalized skill names present in the job description
+    """
+    global skill_index_matcher
+    vocabulary = db_manager.get_indexed_skills()
+    # Rebuild the matcher only when the vocabulary changed
+    if skill_index_matcher is None or skill_index_matcher[0] is not vocabulary:
+        skill_index_matcher = (vocabulary, SkillMatcher(sorted(vocabulary)))
+    return skill_index_matcher[1].find(job_description)
+
+
+def read_upload(file, chunk_size=64 * 1024):
+    """
+    Read an uploaded file into memory while hashing its bytes
+    
+    Args:
+        file: Uploaded FileStorage
+        chunk_size: Bytes read per chunk
+        
+    Returns:
+        Tuple of (file contents, SHA-256 hex digest)
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    while True:
+        chunk = file.stream.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        buffer.extend(chunk)
+    return bytes(buffer), digest.hexdigest()
+
+
+def duplicate_result(filename, existing):
+    """
+    Build the upload result returned for an already stored file
+    
+    Args:
+        filename: Name the file was uploaded under
+        existing: Stored candidate with the same content
+        
+    Returns:
+        Upload result dictionary
+    """
+    return {
+        'success': True,
+        'duplicate': True,
+        'candidate_id': existing['id'],
+        'filename': filename,
+        'existing_filename': existing['filename'],
+        'data': existing['data']
+    }
+
+
+def write_upload(filepath, content):
+    """Write an uploaded file to disk atomically"""
+    temp_path = f"{filepath}.{os.getpid()}.{uuid.uuid4().hex}.part"
+    try:
+        with open(temp_path, 'wb') as out:
+            out.write(content)
+        os.replace(temp_path, filepath)
+    except Exception as e:
+        print(f"Error saving upload {filepath}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def persist_upload(filename, content):
+    """Keep a copy of the original upload in the background, if enabled"""
+    if Config.PERSIST_UPLOADS:
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        upload_writer.submit(write_upload, filepath, content)
+
+
+def select_candidates(job_description, match_all_skills=False, after_id=None, through_id=None):
+    """
+    Select the candidates to score for a job using the skill index
+    
+    Only candidates sharing at least one skill with the job (or all of
+    them with match_all_skills) are returned; the whole pool is returned
+    when the job mentions no indexed skill. The vector matcher ranks the
+    whole pool by similarity, so for it only match_all_skills filters.
+    
+    Args:
+        job_description: Job description text
+        match_all_skills: Require every job skill instead of any
+        after_id: Only select candidates with a higher ID
+        through_id: Only select candidates with this ID or lower
+        
+    Returns:
+        List of candidate dictionaries with feature records (no resume text)
+    """
+    uses_vectors = getattr(job_matcher, 'USES_VECTORS', False)
+    # The memory-mapped vector scan is already the cheap full-pool path
+    job_skills = find_job_skills(job_description) if match_all_skills or not uses_vectors else None
+    candidates = db_manager.get_match_candidates(
+        job_skills or None,
+        match_all=match_all_skills,
+        after_id=after_id,
+        through_id=through_id
+    )
+    if uses_vectors:
+        ensure_vectors(candidates)
+    return ensure_features(candidates)
+
+
+def ensure_features(candidates):
+    """
+    Build and store feature records missing from older candidates
+    
+    Args:
+        candidates: List of candidate dictionaries from get_match_candidates
+        
+    Returns:
+        The same candidates, each with an up-to-date feature record
+    """
+    stale = [
+        candidate for candidate in candidates
+        if not candidate['features'] or candidate['features'].get('version') != FEATURE_VERSION
+    ]
+    if stale:
+        texts = db_manager.get_resume_texts([candidate['id'] for candidate in stale])
+        for candidate in stale:
+            candidate['features'] = build_resume_features(texts[candidate['id']], candidate['data'])
+        db_manager.save_candidate_features({
+            candidate['id']: candidate['features'] for candidate in stale
+        })
+    return candidates
+
+
+def ensure_vectors(candidates):
+    """
+    Build and store text vectors missing from the vector store
+    
+    Covers candidates saved before vectors existed and vectors of another
+    size (VECTOR_DIM changed).
+    
+    Args:
+        candidates: List of candidate dictionaries from get_match_candidates
+        
+    Returns:
+        The same candidates
+    """
+    stored = db_manager.vectors.contains([candidate['id'] for candidate in candidates])
+    stale = [candidate for candidate, found in zip(candidates, stored) if not found]
+    if stale:
+        texts = db_manager.get_resume_texts([candidate['id'] for candidate in stale])
+        db_manager.save_candidate_vectors({
+            candidate['id']: vectorize(texts[candidate['id']]).tobytes() for candidate in stale
+        })
+    return candidates
+
+
+def get_llm_matcher():
+    """Get the LLM matcher used by cascade mode"""
+    global llm_matcher
+    if isinstance(job_matcher, LLMJobMatcher):
+        return job_matcher
+    if llm_matcher is None:
+        llm_matcher = LLMJobMatcher(db_manager.get_resume_texts)
+    return llm_matcher
+
+
+def get_job_profile(job_description, matcher=None):
+    """
+    Get the compiled profile of a job description
+    
+    Profiles are looked up by content hash in memory, then in earlier job
+    postings, and only compiled when the description has not been seen.
+    
+    Args:
+        job_description: Job description text
+        matcher: Matcher compiling the profile (defaults to job_matcher)
+        
+    Returns:
+        Tuple of (profile content hash, profile dictionary)
+    """
+    matcher = matcher or job_matcher
+    profile_hash = job_profile_key(job_description, matcher.PROFILE_VERSION)
+    profile = job_profiles.get(profile_hash)
+    if profile is None:
+        profile = db_manager.get_job_profile(profile_hash)
+        if profile is None:
+            profile = matcher.compile_job_profile(job_description)
+        # Fallback profiles (failed compilation) are retried next time
+        if not profile.get('fallback'):
+            job_profiles.put(profile_hash, profile)
+    return profile_hash, profile
+
+
+def stored_profile(profile):
+    """Get the profile to store with a job posting (None for fallbacks)"""
+    return None if profile.get('fallback') else profile
+
+
+def build_result(candidate, match_result):
+    """Build the stored and returned result for a scored candidate"""
+    result = {
+        'candidate_id': candidate['id'],
+        'filename': candidate['filename'],
+        'name': candidate['data'].get('name', 'Unknown'),
+        'score': match_result['score'],
+        'justification': match_result['justification'],
+        'key_matches': match_result.get('key_matches', []),
+        'gaps': match_result.get('gaps', [])
+    }
+    # Cascade mode records which scorer produced the score
+    if 'scorer' in match_result:
+        result['scorer'] = match_result['scorer']
+    return result
+
+
+def cascade_score_candidates(candidates, job_description, job_title, threshold, band, top_n):
+    """
+    Score candidates with the keyword heuristic, re-scoring only the
+    borderline band (and optionally the top-N) with the LLM
+    
+    Args:
+        candidates: List of candidate dictionaries
+        job_description: Job description text
+        job_title: Title of the position
+        threshold: Minimum score for shortlisting
+        band: Distance from the threshold re-scored by the LLM
+        top_n: Number of best heuristic scores re-scored by the LLM
+        
+    Returns:
+        Tuple of (result dictionaries in candidate order, cascade statistics)
+    """
+    llm = get_llm_matcher()
+    cascade = CascadeMatcher(keyword_matcher, llm, band=band, top_n=top_n)
+    _, heuristic_profile = get_job_profile(job_description, keyword_matcher)
+    
+    match_results, stats = cascade.match_candidates(
+        candidates, job_description, job_title, threshold, heuristic_profile,
+        get_llm_profile=lambda: get_job_profile(job_description, llm)[1]
+    )
+    results = [
+        build_result(candidate, match_result)
+        for candidate, match_result in zip(candidates, match_results)
+    ]
+    return results, stats
+
+
+def score_candidates(candidates, job_description, job_title, profile=None):
+    """
+    Score candidates against a job
+    
+    Args:
+        candidates: List of candidate dictionaries
+        job_description: Job description text
+        job_title: Title of the position
+        profile: Compiled job profile from get_job_profile
+        
+    Returns:
+        List of result dictionaries for every candidate, in candidate order
+    """
+    # Score all candidates in one batch
+    match_results = job_matcher.match_candidates(candidates, job_description, job_title, profile)
+    return [
+        build_result(candidate, match_result)
+        for candidate, match_result in zip(candidates, match_results)
+    ]
+
+
+def job_scoring(cascade=False, band=None, top_n=None):
+    """
+    Describe how a job is scored, as stored with its posting
+    
+    Args:
+        cascade: Whether the job uses cascade mode
+        band: Cascade band, for cascade mode
+        top_n: Cascade top-N, for cascade mode
+        
+    Returns:
+        Dictionary with 'match_mode', 'matcher', 'cascade_band' and 'cascade_top_n'
+    """
+    if cascade:
+        return {'match_mode': 'cascade', 'matcher': 'keyword+llm', 'cascade_band': band, 'cascade_top_n': top_n}
+    return {'match_mode': 'standard', 'matcher': Config.JOB_MATCHER, 'cascade_band': None, 'cascade_top_n': None}
+
+
+def rematch_conflict(job):
+    """
+    Check that a job can be re-matched with the scorer it was scored with
+    
+    Args:
+        job: Job dictionary from DatabaseManager.get_rematch_jobs
+        
+    Returns:
+        Reason the job cannot be re-matched, or None
+    """
+    scoring = job['scoring']
+    if not scoring['match_mode'] or not scoring['matcher']:
+        return 'Job was scored before its scorer was recorded; run the match again instead'
+    if scoring['match_mode'] == 'cascade':
+        try:
+            get_llm_matcher()
+        except ValueError as e:
+            return f'Job was scored in cascade mode, which needs the LLM matcher: {e}'
+    elif scoring['matcher'] != Config.JOB_MATCHER:
+        return (f"Job was scored with the {scoring['matcher']} matcher, "
+                f"but JOB_MATCHER is now {Config.JOB_MATCHER}; run the match again instead")
+    return None
+
+
+def shortlist(results, threshold):
+    """Keep results at or above the threshold, highest score first"""
+    return sorted(
+        (result for result in results if result['score'] >= threshold),
+        key=lambda x: x['score'],
+        reverse=True
+    )
+
+
+def run_match_job(job_id, job_title, job_description, threshold, match_all_skills):
+    """
+    Score candidates for a queued job in the background
+    
+    Results are saved chunk by chunk so progress and the partial
+    shortlist can be polled while the job runs.
+    
+    Args:
+        job_id: ID of the queued job posting
+        job_title: Title of the position
+        job_description: Job description text
+        threshold: Minimum score for shortlisting
+        match_all_skills: Require every job skill instead of any
+    """
+    try:
+        db_manager.update_job_status(job_id, status='running')
+        profile_hash, profile = get_job_profile(job_description)
+        if stored_profile(profile):
+            db_manager.save_job_profile(job_id, profile_hash, profile)
+        scored_through = db_manager.get_max_candidate_id()
+        candidates = select_candidates(job_description, match_all_skills, through_id=scored_through)
+        db_manager.update_job_status(
+            job_id, total_candidates=len(candidates), scored_through=scored_through
+        )
+        
+        chunk_size = Config.MATCH_JOB_CHUNK_SIZE
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start:start + chunk_size]
+            results = score_candidates(chunk, job_description, job_title, profile)
+            # Save the chunk and its progress together
+            with db_manager.connection():
+                db_manager.save_match_results(job_id, results)
+                db_manager.update_job_status(job_id, scored_candidates=start + len(chunk))
+            job_results.invalidate(job_id)
+        
+        db_manager.update_job_status(job_id, status='completed')
+    except Exception as e:
+        print(f"MATCH JOB {job_id} ERROR: {e}")
+        db_manager.update_job_status(job_id, status='failed', error=str(e))
+
+
+def rematch_job(job):
+    """
+    Score a saved job against the candidates uploaded since it was last scored
+    
+    Only candidates above the job's scored_through ID are selected and
+    scored, the same way the job was scored (see rematch_conflict), and
+    their results are merged into the job's stored scores.
+    
+    Args:
+        job: Job dictionary from DatabaseManager.get_rematch_jobs
+        
+    Returns:
+        Dictionary with the number of new candidates scored and the new
+        candidates reaching the job's threshold
+    """
+    threshold = job['threshold'] if job['threshold'] is not None else Config.DEFAULT_MATCH_THRESHOLD
+    summary = {
+        'job_id': job['id'],
+        'job_title': job['job_title'],
+        'threshold': threshold,
+        'new_candidates': 0,
+        'shortlisted_count': 0,
+        'shortlisted_candidates': []
+    }
+    
+    scored_through = db_manager.get_max_candidate_id()
+    if scored_through <= job['scored_through']:
+        return summary
+    
+    candidates = select_candidates(
+        job['job_description'],
+        job['match_all_skills'],
+        after_id=job['scored_through'],
+        through_id=scored_through
+    )
+    scoring = job['scoring']
+    if scoring['match_mode'] == 'cascade':
+        results, _ = cascade_score_candidates(
+            candidates, job['job_description'], job['job_title'], threshold,
+            band=scoring['cascade_band'], top_n=scoring['cascade_top_n']
+        )
+    else:
+        _, profile = get_job_profile(job['job_description'])
+        results = score_candidates(candidates, job['job_description'], job['job_title'], profile)
+    
+    if not db_manager.merge_match_results(job['id'], results, job['scored_through'], scored_through):
+        # Another re-match of this job got there first
+        return summary
+    job_results.invalidate(job['id'])
+    
+    shortlisted = shortlist(results, threshold)
+    summary.update({
+        'new_candidates': len(candidates),
+        'shortlisted_count': len(shortlisted),
+        'shortlisted_candidates': shortlisted
+    })
+    return summary
+
+
+def collect_bulk_uploads(files):
+    """
+    Collect resume files from a bulk upload, expanding ZIP archives
+    
+    Args:
+        files: List of uploaded FileStorage objects
+        
+    Returns:
+        List of (filename, file bytes or None, error or None) tuples
+    """
+    uploads = []
+    for file in files:
+        if file.filename.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(file.stream) as archive:
+                    members = [m for m in archive.infolist() if not m.is_dir()]
+                    if len(members) > Config.MAX_ZIP_FILES:
+                        uploads.append((file.filename, None, f'ZIP has more than {Config.MAX_ZIP_FILES} files'))
+                        continue
+                    total_size = 0
+                    for member in members:
+                        name = os.path.basename(member.filename)
+                        if not name or name.startswith('.') or not allowed_file(name):
+                            continue
+                        if member.file_size > Config.MAX_FILE_SIZE:
+                            uploads.append((name, None, 'File too large'))
+                            continue
+                        # Guard against ZIP bombs
+                        total_size += member.file_size
+                        if total_size > Config.MAX_BULK_UPLOAD_SIZE:
+                            uploads.append((name, None, 'ZIP contents too large'))
+                            break
+                        uploads.append((name, archive.read(member), None))
+            except zipfile.BadZipFile:
+                uploads.append((file.filename, None, 'Invalid ZIP archive'))
+        elif not allowed_file(file.filename):
+            uploads.append((file.filename, None, 'Invalid file type. Only PDF, TXT and ZIP allowed'))
+        else:
+            content = file.read()
+            if len(content) > Config.MAX_FILE_SIZE:
+                uploads.append((file.filename, None, 'File too large'))
+            else:
+                uploads.append((file.filename, content, None))
+    return uploads
+
+
 @app.route('/')
 def index():
     """Serve the frontend HTML"""
@@ -74,6 +604,9 @@ def upload_resume():
     """
     import traceback
     try:
+        # Reject oversized uploads before the body is read
+        if request.content_length and request.content_length > Config.MAX_FILE_SIZE:
+            return jsonify({'error': 'File too large'}), 413
         # Check if file is in request
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
@@ -82,18 +615,31 @@ def upload_resume():
             return jsonify({'error': 'No file selected'}), 400
         if not allowed_file(file.filename):
             return jsonify({'error': 'Invalid file type. Only PDF and TXT allowed'}), 400
-        # Save file
+        # Read the upload into memory, hashing it as it streams in
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        # Parse resume
-        resume_text = resume_parser.parse(filepath)
+        content, content_hash = read_upload(file)
+        # Return the existing candidate if these exact bytes were uploaded before
+        existing = db_manager.get_candidate_by_hash(content_hash)
+        if existing:
+            return jsonify(duplicate_result(filename, existing)), 200
+        persist_upload(filename, content)
+        # Parse resume from the in-memory buffer
+        resume_text = resume_parser.parse_bytes(content, file.filename.rsplit('.', 1)[1])
         # Extract structured data using LLM
         candidate_data = data_extractor.extract_candidate_info(resume_text)
+        # Precompute the features used for matching
+        features = build_resume_features(resume_text, candidate_data)
         # Save to database
-        candidate_id = db_manager.save_candidate(filename, resume_text, candidate_data)
+        candidate_id = db_manager.save_candidate(
+            filename, resume_text, candidate_data, content_hash, features,
+            vectorize(resume_text).tobytes()
+        )
+        if candidate_id is None:
+            # The same file was saved by a concurrent upload
+            return jsonify(duplicate_result(filename, db_manager.get_candidate_by_hash(content_hash))), 200
         return jsonify({
             'success': True,
+            'duplicate': False,
             'candidate_id': candidate_id,
             'filename': filename,
             'data': candidate_data
@@ -105,6 +651,110 @@ def upload_resume():
         return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
 
 
+@app.route('/api/upload-resumes', methods=['POST', 'OPTIONS'])
+def upload_resumes():
+    """
+    Upload and parse many resumes (several files and/or ZIP archives)
+    Returns: Per-file results with candidate IDs and extracted information
+    """
+    import traceback
+    try:
+        files = request.files.getlist('files') + request.files.getlist('file')
+        files = [f for f in files if f.filename]
+        if not files:
+            return jsonify({'error': 'No files provided'}), 400
+        
+        results = []
+        pending = []  # (result, content, extension, content_hash) waiting for parsing
+        seen_hashes = {}
+        
+        for name, content, error in collect_bulk_uploads(files):
+            filename = secure_filename(name) or 'resume'
+            result = {'filename': filename}
+            results.append(result)
+            if error:
+                result.update({'success': False, 'error': error})
+                continue
+            
+            # Skip files already stored or repeated within this upload
+            content_hash = hashlib.sha256(content).hexdigest()
+            existing = db_manager.get_candidate_by_hash(content_hash)
+            if existing:
+                result.update(duplicate_result(filename, existing))
+                continue
+            if content_hash in seen_hashes:
+                result.update({'duplicate': True, 'duplicate_of': seen_hashes[content_hash]})
+                continue
+            seen_hashes[content_hash] = result
+            
+            persist_upload(filename, content)
+            pending.append((result, content, name.rsplit('.', 1)[1], content_hash))
+        
+        # Parse and extract across worker processes
+        futures = [
+            ingest_pool.submit(resume_ingest.parse_and_extract, content, ext)
+            for _, content, ext, _ in pending
+        ]
+        
+        parsed = []
+        for (result, _, _, content_hash), future in zip(pending, futures):
+            try:
+                resume_text, candidate_data, features, vector = future.result()
+            except Exception as e:
+                result.update({'success': False, 'error': str(e)})
+                continue
+            parsed.append((result, resume_text, candidate_data, features, vector, content_hash))
+        
+        # Insert all candidates in one transaction
+        candidate_ids = db_manager.save_candidates_bulk([
+            {
+                'filename': result['filename'],
+                'resume_text': resume_text,
+                'data': candidate_data,
+                'content_hash': content_hash,
+                'features': features,
+                'vector': vector
+            }
+            for result, resume_text, candidate_data, features, vector, content_hash in parsed
+        ])
+        for (result, _, candidate_data, _, _, content_hash), candidate_id in zip(parsed, candidate_ids):
+            if candidate_id is None:
+                # The same file was saved by a concurrent upload
+                result.update(duplicate_result(result['filename'], db_manager.get_candidate_by_hash(content_hash)))
+                continue
+            result.update({
+                'success': True,
+                'duplicate': False,
+                'candidate_id': candidate_id,
+                'data': candidate_data
+            })
+        
+        # Resolve duplicates within this upload to the first copy's result
+        for result in results:
+            first = result.pop('duplicate_of', None)
+            if first is not None:
+                if first.get('success'):
+                    result.update({
+                        'success': True,
+                        'candidate_id': first['candidate_id'],
+                        'data': first['data']
+                    })
+                else:
+                    result.update({'success': False, 'error': first.get('error')})
+        
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'uploaded_count': sum(1 for candidate_id in candidate_ids if candidate_id is not None),
+            'failed_count': sum(1 for r in results if not r.get('success')),
+            'results': results
+        }), 200
+    except Exception as e:
+        print('BULK UPLOAD ERROR:', str(e))
+        traceback.print_exc()
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+
 @app.route('/api/match-job', methods=['POST'])
 def match_job():
     """
@@ -120,62 +770,396 @@ def match_job():
         job_description = data['job_description']
         job_title = data.get('job_title', 'Position')
         threshold = data.get('threshold', 6.0)  # Minimum score threshold
+        match_all_skills = data.get('skill_match', 'any') == 'all'  # Intersection vs union
+        cascade = data.get('mode', 'standard') == 'cascade'  # Heuristic first, LLM for the borderline band
         
-        # Get all candidates from database
-        candidates = db_manager.get_all_candidates()
+        total_candidates = db_manager.count_candidates()
         
-        if not candidates:
+        if not total_candidates:
             return jsonify({'error': 'No candidates found. Please upload resumes first.'}), 404
         
-        # Match each candidate
-        results = []
-        for candidate in candidates:
-            match_result = job_matcher.match_candidate(
-                candidate['data'],
-                candidate['resume_text'],
-                job_description,
-                job_title
+        if cascade:
+            if data.get('async'):
+                return jsonify({'error': 'Cascade mode does not support async jobs'}), 400
+            try:
+                get_llm_matcher()
+            except ValueError as e:
+                return jsonify({'error': f'Cascade mode needs the LLM matcher: {e}'}), 400
+        
+        # Queue the scoring and return right away in async mode
+        if data.get('async'):
+            job_id = db_manager.create_job_posting(
+                job_title, job_description, threshold, match_all_skills=match_all_skills,
+                scoring=job_scoring()
             )
-            
-            if match_result['score'] >= threshold:
-                results.append({
-                    'candidate_id': candidate['id'],
-                    'filename': candidate['filename'],
-                    'name': candidate['data'].get('name', 'Unknown'),
-                    'score': match_result['score'],
-                    'justification': match_result['justification'],
-                    'key_matches': match_result.get('key_matches', []),
-                    'gaps': match_result.get('gaps', [])
-                })
+            match_executor.submit(
+                run_match_job, job_id, job_title, job_description, threshold, match_all_skills
+            )
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/job/{job_id}/status'
+            }), 202
+        
+        profile_hash, profile = get_job_profile(job_description)
+        scored_through = db_manager.get_max_candidate_id()
+        candidates = select_candidates(job_description, match_all_skills, through_id=scored_through)
+        cascade_stats = None
+        if cascade:
+            scoring = job_scoring(
+                cascade,
+                band=float(data.get('cascade_band', Config.CASCADE_BAND)),
+                top_n=int(data.get('cascade_top_n', Config.CASCADE_TOP_N))
+            )
+            results, cascade_stats = cascade_score_candidates(
+                candidates, job_description, job_title, threshold,
+                band=scoring['cascade_band'],
+                top_n=scoring['cascade_top_n']
+            )
+        else:
+            scoring = job_scoring()
+            results = score_candidates(candidates, job_description, job_title, profile)
         
         # Sort by score (descending)
         results.sort(key=lambda x: x['score'], reverse=True)
+        shortlisted = shortlist(results, threshold)
         
-        # Save job matching results
-        job_id = db_manager.save_job_matching(job_title, job_description, results)
+        # Save every score, so other thresholds are a query away
+        job_id = db_manager.save_job_matching(
+            job_title, job_description, results, threshold, profile_hash, stored_profile(profile),
+            scored_through, match_all_skills, scoring
+        )
         
-        return jsonify({
+        response = {
             'success': True,
             'job_id': job_id,
             'job_title': job_title,
             'threshold': threshold,
-            'total_candidates': len(candidates),
-            'shortlisted_count': len(results),
-            'shortlisted_candidates': results
+            'total_candidates': total_candidates,
+            'scored_candidates': len(candidates),
+            'shortlisted_count': len(shortlisted),
+            'shortlisted_candidates': shortlisted,
+            'shortlist_url': f'/api/job/{job_id}/shortlist'
+        }
+        if cascade_stats:
+            response['cascade'] = cascade_stats
+        return jsonify(response), 200
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def sse_event(event, data):
+    """Format a Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route('/api/match-job/stream', methods=['POST'])
+def match_job_stream():
+    """
+    Match candidates against a job description, streaming results as
+    Server-Sent Events: one 'candidate' event per scored candidate, then a
+    'summary' event with the persisted job_id (or an 'error' event)
+    """
+    data = request.get_json()
+    
+    if not data or 'job_description' not in data:
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    job_description = data['job_description']
+    job_title = data.get('job_title', 'Position')
+    threshold = data.get('threshold', 6.0)  # Minimum score threshold
+    match_all_skills = data.get('skill_match', 'any') == 'all'  # Intersection vs union
+    
+    total_candidates = db_manager.count_candidates()
+    
+    if not total_candidates:
+        return jsonify({'error': 'No candidates found. Please upload resumes first.'}), 404
+    
+    def generate():
+        try:
+            profile_hash, profile = get_job_profile(job_description)
+            scored_through = db_manager.get_max_candidate_id()
+            candidates = select_candidates(job_description, match_all_skills, through_id=scored_through)
+            yield sse_event('start', {
+                'job_title': job_title,
+                'threshold': threshold,
+                'total_candidates': total_candidates,
+                'scored_candidates': len(candidates)
+            })
+            
+            results = []
+            for scored, (index, match_result) in enumerate(
+                job_matcher.iter_match_candidates(candidates, job_description, job_title, profile), 1
+            ):
+                result = build_result(candidates[index], match_result)
+                results.append(result)
+                shortlisted = match_result['score'] >= threshold
+                yield sse_event('candidate', {
+                    **result,
+                    'shortlisted': shortlisted,
+                    'scored': scored,
+                    'total': len(candidates)
+                })
+            
+            # Sort by score (descending) and save every score
+            results.sort(key=lambda x: x['score'], reverse=True)
+            job_id = db_manager.save_job_matching(
+                job_title, job_description, results, threshold, profile_hash, stored_profile(profile),
+                scored_through, match_all_skills, job_scoring()
+            )
+            
+            yield sse_event('summary', {
+                'success': True,
+                'job_id': job_id,
+                'job_title': job_title,
+                'threshold': threshold,
+                'total_candidates': total_candidates,
+                'scored_candidates': len(candidates),
+                'shortlisted_count': len(shortlist(results, threshold)),
+                'shortlist_url': f'/api/job/{job_id}/shortlist'
+            })
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/job/<int:job_id>/status', methods=['GET'])
+def get_job_status(job_id):
+    """Get progress and partial shortlist of a match job"""
+    try:
+        job = db_manager.get_job_status(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        shortlisted = db_manager.get_job_shortlist(job_id, threshold=job['threshold'])
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'job_title': job['job_title'],
+            'status': job['status'],
+            'error': job['error'],
+            'threshold': job['threshold'],
+            'scored': job['scored_candidates'],
+            'total': job['total_candidates'],
+            'shortlisted_count': len(shortlisted),
+            'shortlisted_candidates': shortlisted
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/job/<int:job_id>/shortlist', methods=['GET'])
+def get_job_shortlist(job_id):
+    """
+    Get the shortlist of a scored job for any threshold and/or top-K
+    from the stored scores, without scoring again
+    Query params: threshold (defaults to the job's threshold), top_k
+    """
+    try:
+        job = db_manager.get_job_status(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        threshold = request.args.get('threshold', type=float)
+        if threshold is None:
+            threshold = job['threshold']
+        top_k = request.args.get('top_k', type=int)
+        if top_k is not None and top_k < 1:
+            return jsonify({'error': 'top_k must be a positive integer'}), 400
+        
+        shortlisted = db_manager.get_job_shortlist(job_id, threshold=threshold, limit=top_k)
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'job_title': job['job_title'],
+            'status': job['status'],
+            'threshold': threshold,
+            'top_k': top_k,
+            'scored_candidates': job['scored_candidates'],
+            'shortlisted_count': len(shortlisted),
+            'shortlisted_candidates': shortlisted
         }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/job/<int:job_id>/matches', methods=['GET'])
+def get_job_matches(job_id):
+    """
+    Get the stored results of a past job, one page at a time, without
+    scoring again
+    Query params: sort (score, name, filename, created_at), order (asc, desc),
+    limit, offset
+    """
+    try:
+        job = db_manager.get_job_status(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        sort = request.args.get('sort', 'score')
+        order = request.args.get('order', 'desc').lower()
+        if order not in ('asc', 'desc'):
+            return jsonify({'error': 'order must be asc or desc'}), 400
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        offset = max(request.args.get('offset', 0, type=int), 0)
         
+        # Any write to the job's results changes its status or progress
+        version = (job['status'], job['total_candidates'], job['scored_candidates'])
+        query = (sort, order, limit, offset)
+        page = job_results.get(job_id, version, query)
+        if page is None:
+            try:
+                matches = db_manager.get_job_matches(
+                    job_id, sort=sort, descending=order == 'desc', limit=limit, offset=offset
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            total = db_manager.count_job_matches(job_id)
+            page = {
+                'total': total,
+                'count': len(matches),
+                'next_offset': offset + len(matches) if offset + len(matches) < total else None,
+                'matches': matches
+            }
+            job_results.put(job_id, version, query, page)
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'job_title': job['job_title'],
+            'status': job['status'],
+            'threshold': job['threshold'],
+            'sort': sort,
+            'order': order,
+            'limit': limit,
+            'offset': offset,
+            **page
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/job/<int:job_id>/rematch', methods=['POST'])
+def rematch_one_job(job_id):
+    """
+    Score a saved job against only the candidates uploaded since it was
+    last scored, merging the new scores into its stored results
+    """
+    try:
+        jobs = db_manager.get_rematch_jobs(job_id)
+        if not jobs:
+            return jsonify({'error': 'Job not found'}), 404
+        if jobs[0]['status'] != 'completed':
+            return jsonify({'error': f"Job is {jobs[0]['status']}; only completed jobs can be re-matched"}), 409
+        conflict = rematch_conflict(jobs[0])
+        if conflict:
+            return jsonify({'error': conflict}), 409
+        
+        return jsonify({'success': True, **rematch_job(jobs[0])}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/jobs/rematch', methods=['POST'])
+def rematch_open_jobs():
+    """
+    Score every completed job against the candidates uploaded since it
+    was last scored; jobs that cannot be re-matched the way they were
+    scored are listed as skipped
+    """
+    try:
+        results = []
+        skipped = []
+        for job in db_manager.get_rematch_jobs():
+            conflict = rematch_conflict(job)
+            if conflict:
+                skipped.append({'job_id': job['id'], 'job_title': job['job_title'], 'error': conflict})
+            else:
+                results.append(rematch_job(job))
+        
+        return jsonify({
+            'success': True,
+            'jobs': results,
+            'skipped': skipped,
+            'new_scores': sum(result['new_candidates'] for result in results)
+        }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/candidates', methods=['GET'])
 def get_candidates():
-    """Get all candidates"""
+    """
+    Get candidates, newest first, one page at a time
+    Query params: after_id (cursor), limit, fields (comma separated), summary
+    """
     try:
-        candidates = db_manager.get_all_candidates()
+        after_id = request.args.get('after_id', type=int)
+        limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+        summary = request.args.get('summary', 'false').lower() in ('1', 'true', 'yes')
+        
+        if summary:
+            fields = list(db_manager.CANDIDATE_SUMMARY_FIELDS)
+        elif request.args.get('fields'):
+            fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        else:
+            fields = None
+        
+        try:
+            candidates, next_after_id = db_manager.get_candidates_page(
+                after_id=after_id, limit=limit, fields=fields
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         return jsonify({
             'success': True,
             'count': len(candidates),
+            'total': db_manager.count_candidates(),
+            'next_after_id': next_after_id,
+            'candidates': candidates
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/candidates/search', methods=['GET'])
+def search_candidates():
+    """
+    Full-text search over resume text and skills, ranked by BM25
+    Query params: q (words or "quoted phrases"), match (all|any), limit, offset
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Search query (q) is required'}), 400
+        
+        match_all = request.args.get('match', 'all') != 'any'
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        
+        try:
+            candidates, next_offset = db_manager.search_candidates(
+                query, match_all=match_all, limit=limit, offset=offset
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'count': len(candidates),
+            'offset': offset,
+            'next_offset': next_offset,
             'candidates': candidates
         }), 200
     except Exception as e:
@@ -212,11 +1196,33 @@ def get_job_history():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/llm-cache/stats', methods=['GET'])
+def get_llm_cache_stats():
+    """
+    Get LLM response cache statistics
+    Hit/miss counters belong to the answering server process; entries and
+    bytes cover the cache file shared by all processes
+    """
+    try:
+        cache = get_llm_cache()
+        if cache is None:
+            return jsonify({'success': True, 'enabled': False}), 200
+        return jsonify({
+            'success': True,
+            'enabled': True,
+            'process_id': os.getpid(),
+            **cache.stats()
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/clear-database', methods=['POST'])
 def clear_database():
     """Clear all data from database"""
     try:
         db_manager.clear_all_data()
+        job_results.clear()
         return jsonify({
             'success': True,
             'message': 'Database cleared successfully'
@@ -227,6 +1233,10 @@ def clear_database():
 
 # Initialize database on startup
 db_manager.init_db()
+# Jobs of a previous server process can no longer finish
+interrupted_jobs = db_manager.fail_interrupted_jobs()
+if interrupted_jobs:
+    print(f"⚠️  Marked {len(interrupted_jobs)} interrupted match job(s) as failed")
 
 if __name__ == '__main__':
     # Run the application
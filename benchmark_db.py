@@ -0,0 +1,127 @@
+"""
+Database Benchmark - Concurrent readers and writers
+Compares pooled WAL connections against a fresh rollback-journal connection per call
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import Config
+from database.db_manager import DatabaseManager
+
+
+class LegacyDatabaseManager(DatabaseManager):
+    """DatabaseManager opening a new default-mode connection for every call"""
+    
+    def get_connection(self):
+        """Get a fresh connection without pooling or pragmas"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """Open, commit and close a connection per call"""
+        conn = self.get_connection()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def run(manager_class, db_path, readers, writers, duration, seed):
+    """
+    Run readers and writers against one database for a fixed duration
+    
+    Args:
+        manager_class: DatabaseManager class to benchmark
+        db_path: Path of the database file
+        readers: Number of reader threads
+        writers: Number of writer threads
+        duration: Seconds to run
+        seed: Number of candidates inserted before the run
+    
+    Returns:
+        Dictionary with read/write counts and errors
+    """
+    Config.DATABASE_PATH = db_path
+    # Never touch the configured vector store
+    Config.VECTOR_STORE_PATH = f"{db_path}.vectors.f32"
+    db = manager_class()
+    db.init_db()
+    for i in range(seed):
+        db.save_candidate(f"seed_{i}.txt", "Python developer " * 50, {'name': f"Seed {i}", 'skills': ['Python']})
+    
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    stop = time.time() + duration
+    
+    def reader():
+        done = errors = 0
+        while time.time() < stop:
+            try:
+                db.get_candidate(1 + done % seed)
+                db.count_candidates()
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        with lock:
+            counts['reads'] += done
+            counts['errors'] += errors
+    
+    def writer():
+        done = errors = 0
+        while time.time() < stop:
+            try:
+                db.save_candidate("bench.txt", "Go developer " * 50, {'name': "Bench", 'skills': ['Go', 'Docker']})
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        with lock:
+            counts['writes'] += done
+            counts['errors'] += errors
+    
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    return counts
+
+
+def main():
+    """Run the benchmark for both connection strategies"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--seed', type=int, default=200)
+    args = parser.parse_args()
+    
+    print(f"Readers: {args.readers}  Writers: {args.writers}  Duration: {args.duration}s")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, manager_class in [('per-call connection', LegacyDatabaseManager),
+                                     ('pooled WAL', DatabaseManager)]:
+            db_path = str(Path(tmp) / f"{manager_class.__name__}.db")
+            counts = run(manager_class, db_path, args.readers, args.writers, args.duration, args.seed)
+            print(
+                f"{label:>20}: "
+                f"{counts['reads'] / args.duration:8.0f} reads/s  "
+                f"{counts['writes'] / args.duration:8.0f} writes/s  "
+                f"{counts['errors']} lock errors"
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,17 +13,59 @@ class Config:
     # OpenAI Configuration
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
     OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None  # OpenAI-compatible endpoint override
     
     # Database Configuration
     DATABASE_PATH = os.getenv('DATABASE_PATH', 'data/resumes.db')
+    DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))  # Wait on locks instead of failing
+    DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', '20000'))  # Page cache per connection
+    DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(256 * 1024 * 1024)))  # 256MB memory-mapped I/O
+    # Memory-mapped candidate vectors (plus '.ids' map); empty = 'vectors.f32' next to the database
+    VECTOR_STORE_PATH = os.getenv('VECTOR_STORE_PATH', '')
+    
+    # LLM Response Cache Configuration (stored next to the database)
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    LLM_CACHE_PATH = os.getenv(
+        'LLM_CACHE_PATH',
+        os.path.join(os.path.dirname(DATABASE_PATH), 'llm_cache.db')
+    )
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '10000'))
+    LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', str(100 * 1024 * 1024)))  # 100MB
+    LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', '0'))  # Seconds, 0 = never expire
     
     # File Upload Configuration
     UPLOAD_FOLDER = 'uploads/resumes'
     MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
+    MAX_BULK_UPLOAD_SIZE = int(os.getenv('MAX_BULK_UPLOAD_SIZE', str(200 * 1024 * 1024)))  # 200MB per bulk request
+    PERSIST_UPLOADS = os.getenv('PERSIST_UPLOADS', 'true').lower() == 'true'  # Keep original files on disk
+    MAX_ZIP_FILES = int(os.getenv('MAX_ZIP_FILES', '5000'))
+    
+    # PDF Parsing Configuration
+    PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '20'))  # Pages read per PDF (0 = all)
+    PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', '20000'))  # Characters kept per PDF (0 = all)
+    PDF_PARALLEL = os.getenv('PDF_PARALLEL', 'false').lower() == 'true'  # Page-parallel extraction (opt-in)
+    PDF_PAGES_PER_WORKER = int(os.getenv('PDF_PAGES_PER_WORKER', '4'))  # Page range size per worker
+    PDF_PAGE_WORKERS = int(os.getenv('PDF_PAGE_WORKERS', str(os.cpu_count() or 1)))
+    INGEST_MAX_WORKERS = int(os.getenv('INGEST_MAX_WORKERS', str(os.cpu_count() or 1)))  # Parsing processes
     ALLOWED_EXTENSIONS = {'pdf', 'txt'}
     
+    # Skill Extraction Configuration (empty = bundled services/data/skills.txt)
+    SKILLS_FILE = os.getenv('SKILLS_FILE', '')
+    
     # Matching Configuration
+    JOB_MATCHER = os.getenv('JOB_MATCHER', 'keyword')  # Matcher backend: keyword, vector (offline similarity) or llm
+    VECTOR_DIM = int(os.getenv('VECTOR_DIM', '1024'))  # Vector matcher: hashed n-gram dimensions (float32)
+    VECTOR_SCAN_CHUNK = int(os.getenv('VECTOR_SCAN_CHUNK', '16384'))  # Vector matcher: rows multiplied per block
     DEFAULT_MATCH_THRESHOLD = 6.0  # Minimum score for shortlisting
+    MATCH_JOB_WORKERS = int(os.getenv('MATCH_JOB_WORKERS', '2'))  # Background async match jobs
+    MATCH_JOB_CHUNK_SIZE = int(os.getenv('MATCH_JOB_CHUNK_SIZE', '50'))  # Candidates scored per progress update
+    MATCH_MAX_WORKERS = int(os.getenv('MATCH_MAX_WORKERS', '8'))  # Parallel LLM match requests (1 = sequential)
+    MATCH_BATCH_SIZE = int(os.getenv('MATCH_BATCH_SIZE', '1'))  # Candidates per LLM match request (1 = one request each)
+    MATCH_BATCH_TOKEN_BUDGET = int(os.getenv('MATCH_BATCH_TOKEN_BUDGET', '6000'))  # Estimated prompt tokens per batched request
+    JOB_PROFILE_CACHE_SIZE = int(os.getenv('JOB_PROFILE_CACHE_SIZE', '256'))  # Compiled job profiles kept in memory
+    JOB_RESULTS_CACHE_SIZE = int(os.getenv('JOB_RESULTS_CACHE_SIZE', '128'))  # Jobs whose result pages are kept in memory
+    CASCADE_BAND = float(os.getenv('CASCADE_BAND', '1.5'))  # Cascade: LLM re-scores heuristic scores this close to the threshold
+    CASCADE_TOP_N = int(os.getenv('CASCADE_TOP_N', '0'))  # Cascade: also re-score the N best heuristic scores
     
     @staticmethod
     def validate():
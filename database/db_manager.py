@@ -4,31 +4,160 @@ Handles SQLite database operations for storing resumes, candidates, and matches
 """
 import sqlite3
 import json
+import os
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from config import Config
-
+from database.vector_store import VectorStore
 
 class DatabaseManager:
     """Manage database operations for the application"""
     
+    # Fields that can be projected from the candidates table
+    CANDIDATE_COLUMNS = ('id', 'filename', 'created_at', 'resume_text', 'data')
+    # Fields that can be projected out of the candidate data JSON
+    CANDIDATE_DATA_FIELDS = (
+        'name', 'email', 'phone', 'location', 'summary', 'skills', 'experience',
+        'education', 'certifications', 'languages', 'total_experience_years'
+    )
+    # Data fields stored as JSON arrays
+    CANDIDATE_LIST_FIELDS = ('skills', 'experience', 'education', 'certifications', 'languages')
+    # Lightweight fields for summary listings
+    CANDIDATE_SUMMARY_FIELDS = ('id', 'filename', 'created_at', 'name', 'email', 'skills', 'total_experience_years')
+    # Default listing fields (everything but the full resume text)
+    CANDIDATE_DEFAULT_FIELDS = ('id', 'filename', 'data', 'created_at')
+    # Sort keys for a job's match results, with their SQL expressions
+    JOB_MATCH_SORTS = {
+        'score': 'mr.score',
+        'name': "json_extract(c.data, '$.name')",
+        'filename': 'c.filename',
+        'created_at': 'mr.created_at'
+    }
+    # job_postings columns recording how a job was scored
+    JOB_SCORING_COLUMNS = ('match_mode', 'matcher', 'cascade_band', 'cascade_top_n')
+    # Largest SQLite row ID, the keyset cursor of a first page
+    MAX_ROW_ID = 2 ** 63 - 1
+    # Latest schema version; each version has a _migrate_to_<n> method
+    SCHEMA_VERSION = 15
+    
     def __init__(self):
         """Initialize database connection"""
         self.db_path = Config.DATABASE_PATH
         # Ensure data directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # One pooled connection per thread (and per process, after fork)
+        self._local = threading.local()
+        # Memory-mapped copy of the candidate vectors scanned by the vector matcher,
+        # kept with this database unless a path is configured
+        vector_store_path = Config.VECTOR_STORE_PATH or os.path.join(
+            os.path.dirname(self.db_path), 'vectors.f32'
+        )
+        self.vectors = VectorStore(vector_store_path, Config.VECTOR_DIM, Config.VECTOR_SCAN_CHUNK)
+        # Skill index vocabulary: (highest candidate ID seen, frozenset of skills)
+        self._skill_vocabulary = None
+        self._skill_vocabulary_lock = threading.Lock()
     
     def get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        """
+        Get this thread's pooled database connection
+        
+        Connections are opened once per thread and process, in WAL mode
+        with tuned pragmas, and reused by every later call.
+        
+        Returns:
+            sqlite3 connection
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        
+        conn = sqlite3.connect(self.db_path, timeout=Config.DB_BUSY_TIMEOUT_MS / 1000)
         conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")  # Safe with WAL, far fewer fsyncs
+        conn.execute(f"PRAGMA busy_timeout = {int(Config.DB_BUSY_TIMEOUT_MS)}")
+        conn.execute(f"PRAGMA cache_size = -{int(Config.DB_CACHE_SIZE_KB)}")
+        conn.execute(f"PRAGMA mmap_size = {int(Config.DB_MMAP_SIZE)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        self._local.depth = 0
         return conn
     
-    def init_db(self):
-        """Initialize database schema"""
+    @contextmanager
+    def connection(self):
+        """
+        Use the pooled connection inside a transaction
+        
+        Commits when the outermost block exits normally and rolls back if
+        it raises. Nested blocks join the outer transaction.
+        
+        Yields:
+            sqlite3 connection
+        """
         conn = self.get_connection()
-        cursor = conn.cursor()
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.rollback()
+            raise
+        else:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.commit()
+    
+    def close_connection(self):
+        """Close this thread's pooled connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            if self._local.pid == os.getpid():
+                conn.close()
+            self._local.conn = None
+    
+    def init_db(self):
+        """Initialize the database schema, upgrading older databases in place"""
+        version = self.migrate()
+        self.sync_vector_store()
+        print(f"✅ Database initialized successfully (schema version {version})")
+    
+    def migrate(self):
+        """
+        Apply pending schema migrations
+        
+        The schema version is kept in PRAGMA user_version. Each migration
+        _migrate_to_<n> runs in its own write transaction together with the
+        version bump, so an interrupted upgrade resumes where it stopped and
+        concurrent processes never apply the same step twice.
         
+        Returns:
+            Schema version after migrating
+        """
+        for version in range(1, self.SCHEMA_VERSION + 1):
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                if not conn.in_transaction:
+                    # Take the write lock before reading the version
+                    cursor.execute("BEGIN IMMEDIATE")
+                
+                cursor.execute("PRAGMA user_version")
+                if cursor.fetchone()[0] >= version:
+                    continue
+                
+                getattr(self, f'_migrate_to_{version}')(cursor)
+                cursor.execute(f"PRAGMA user_version = {version}")
+        
+        with self.connection() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+    
+    def _migrate_to_1(self, cursor):
+        """Create the original candidates, job_postings and match_results tables"""
         # Candidates table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS candidates (
@@ -64,12 +193,222 @@ class DatabaseManager:
                 FOREIGN KEY (candidate_id) REFERENCES candidates (id)
             )
         """)
+    
+    def _migrate_to_2(self, cursor):
+        """Add upload deduplication and the candidate skill index"""
+        self._add_missing_columns(cursor, 'candidates', {'content_hash': 'TEXT'})
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_candidates_content_hash
+            ON candidates (content_hash)
+        """)
+        
+        # Candidate skill postings (inverted index: skill -> candidates)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS candidate_skills (
+                candidate_id INTEGER NOT NULL,
+                skill TEXT NOT NULL,
+                PRIMARY KEY (skill, candidate_id),
+                FOREIGN KEY (candidate_id) REFERENCES candidates (id)
+            ) WITHOUT ROWID
+        """)
+        
+        # Backfill postings for candidates saved before the index existed
+        cursor.execute("""
+            INSERT OR IGNORE INTO candidate_skills (candidate_id, skill)
+            SELECT c.id, lower(trim(j.value))
+            FROM candidates c, json_each(c.data, '$.skills') j
+            WHERE c.id NOT IN (SELECT candidate_id FROM candidate_skills)
+              AND trim(j.value) != ''
+        """)
+    
+    def _migrate_to_3(self, cursor):
+        """Add async job progress tracking and compiled job profiles"""
+        self._add_missing_columns(cursor, 'job_postings', {
+            'status': "TEXT NOT NULL DEFAULT 'completed'",
+            'threshold': 'REAL',
+            'total_candidates': 'INTEGER',
+            'scored_candidates': 'INTEGER',
+            'error': 'TEXT',
+            'profile_hash': 'TEXT',
+            'profile': 'TEXT'
+        })
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_job_postings_profile_hash
+            ON job_postings (profile_hash)
+        """)
+    
+    def _migrate_to_4(self, cursor):
+        """Add precomputed candidate feature records"""
+        self._add_missing_columns(cursor, 'candidates', {'features': 'TEXT'})
+    
+    def _migrate_to_5(self, cursor):
+        """Add indexes for candidate listings and match result lookups"""
+        # Newest-first candidate listings
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_candidates_created_at
+            ON candidates (created_at)
+        """)
+        
+        # Shortlists by job and score (also serves joins on job_id)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_match_results_job_score
+            ON match_results (job_id, score)
+        """)
+        
+        # Results of a candidate across jobs
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_match_results_candidate
+            ON match_results (candidate_id)
+        """)
+    
+    def _migrate_to_6(self, cursor):
+        """Add the full-text search index over resume text and skills"""
+        # rowid is the candidate ID; '+' and '#' are kept for C++, C#, ...
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+                resume_text,
+                skills,
+                tokenize = "unicode61 tokenchars '+#'"
+            )
+        """)
+        
+        # Keep the index in sync with the candidates table
+        skills = "(SELECT group_concat(value, ' ') FROM json_each({row}.data, '$.skills'))"
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS candidates_fts_insert
+            AFTER INSERT ON candidates BEGIN
+                INSERT INTO candidates_fts (rowid, resume_text, skills)
+                VALUES (new.id, new.resume_text, {skills.format(row='new')});
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS candidates_fts_delete
+            AFTER DELETE ON candidates BEGIN
+                DELETE FROM candidates_fts WHERE rowid = old.id;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS candidates_fts_update
+            AFTER UPDATE OF resume_text, data ON candidates BEGIN
+                DELETE FROM candidates_fts WHERE rowid = old.id;
+                INSERT INTO candidates_fts (rowid, resume_text, skills)
+                VALUES (new.id, new.resume_text, {skills.format(row='new')});
+            END
+        """)
+        
+        # Index candidates saved before full-text search existed
+        cursor.execute(f"""
+            INSERT INTO candidates_fts (rowid, resume_text, skills)
+            SELECT c.id, c.resume_text, {skills.format(row='c')}
+            FROM candidates c
+            WHERE c.id NOT IN (SELECT rowid FROM candidates_fts)
+        """)
+    
+    def _migrate_to_7(self, cursor):
+        """Add stored text vectors for the vector matcher"""
+        self._add_missing_columns(cursor, 'candidates', {'vector': 'BLOB'})
+    
+    def _migrate_to_8(self, cursor):
+        """Track which candidates each job has been scored against"""
+        self._add_missing_columns(cursor, 'job_postings', {
+            'scored_through': 'INTEGER',
+            'match_all_skills': 'INTEGER NOT NULL DEFAULT 0'
+        })
         
-        conn.commit()
-        conn.close()
-        print("✅ Database initialized successfully")
+        # Older jobs considered the candidates uploaded before them
+        cursor.execute("""
+            UPDATE job_postings
+            SET scored_through = COALESCE((
+                SELECT MAX(c.id) FROM candidates c
+                WHERE c.created_at <= job_postings.created_at
+            ), 0)
+            WHERE scored_through IS NULL
+        """)
     
-    def save_candidate(self, filename, resume_text, candidate_data):
+    def _migrate_to_9(self, cursor):
+        """Make content hashes unique, so concurrent uploads cannot both insert"""
+        # Earlier duplicates keep their rows (results refer to them) but lose the hash
+        cursor.execute("""
+            UPDATE candidates
+            SET content_hash = NULL
+            WHERE content_hash IS NOT NULL
+              AND id > (
+                  SELECT MIN(c.id) FROM candidates c
+                  WHERE c.content_hash = candidates.content_hash
+              )
+        """)
+        
+        cursor.execute("DROP INDEX IF EXISTS idx_candidates_content_hash")
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_candidates_content_hash
+            ON candidates (content_hash)
+            WHERE content_hash IS NOT NULL
+        """)
+    
+    def _migrate_to_10(self, cursor):
+        """Record which server process runs each asynchronous job"""
+        self._add_missing_columns(cursor, 'job_postings', {'worker_pid': 'INTEGER'})
+    
+    def _migrate_to_11(self, cursor):
+        """Drop the token list and text excerpt from candidate feature records"""
+        # Version 1 records become version 2 records (see FEATURE_VERSION)
+        cursor.execute("""
+            UPDATE candidates
+            SET features = json_set(json_remove(features, '$.tokens', '$.excerpt'), '$.version', 2)
+            WHERE json_extract(features, '$.version') = 1
+        """)
+    
+    def _migrate_to_12(self, cursor):
+        """Add the index for newest-first job history"""
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_job_postings_created_at
+            ON job_postings (created_at)
+        """)
+    
+    def _migrate_to_13(self, cursor):
+        """Record how each job was scored, so re-matches score the same way"""
+        # Older jobs keep NULLs: their scorer is unknown and they cannot be re-matched
+        self._add_missing_columns(cursor, 'job_postings', {
+            'match_mode': 'TEXT',
+            'matcher': 'TEXT',
+            'cascade_band': 'REAL',
+            'cascade_top_n': 'INTEGER'
+        })
+    
+    def _migrate_to_14(self, cursor):
+        """Drop the lowercased job description copy from stored keyword profiles"""
+        cursor.execute("""
+            UPDATE job_postings
+            SET profile = json_remove(profile, '$.job_lower')
+            WHERE json_valid(profile) AND json_type(profile, '$.job_lower') IS NOT NULL
+        """)
+    
+    def _migrate_to_15(self, cursor):
+        """Record which instance of the worker process runs each job, not just its PID"""
+        self._add_missing_columns(cursor, 'job_postings', {'worker_identity': 'TEXT'})
+    
+    def sync_vector_store(self):
+        """
+        Rebuild the vector store if it does not match the stored vectors
+        
+        Covers databases created before the store existed, a deleted store
+        file and a changed VECTOR_DIM.
+        """
+        size = self.vectors.row_bytes
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT COUNT(*) FROM candidates WHERE length(vector) = ?", (size,))
+            if cursor.fetchone()[0] == self.vectors.count():
+                return
+            
+            cursor.execute("SELECT id, vector FROM candidates WHERE length(vector) = ? ORDER BY id", (size,))
+            self.vectors.rebuild((row['id'], row['vector']) for row in cursor)
+    
+    def save_candidate(self, filename, resume_text, candidate_data, content_hash=None,
+                       features=None, vector=None):
         """
         Save candidate information to database
         
@@ -77,23 +416,81 @@ class DatabaseManager:
             filename: Original filename
             resume_text: Extracted text from resume
             candidate_data: Structured candidate information
+            content_hash: SHA-256 hex digest of the uploaded file bytes
+            features: Precomputed feature record used for matching
+            vector: Text vector as float32 bytes (see text_vectorizer)
             
         Returns:
-            ID of inserted candidate
+            ID of inserted candidate, or None if a candidate with the same
+            content_hash is already stored
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        return self.save_candidates_bulk([{
+            'filename': filename,
+            'resume_text': resume_text,
+            'data': candidate_data,
+            'content_hash': content_hash,
+            'features': features,
+            'vector': vector
+        }])[0]
+    
+    def save_candidates_bulk(self, candidates):
+        """
+        Save many candidates in a single transaction
         
-        cursor.execute("""
-            INSERT INTO candidates (filename, resume_text, data)
-            VALUES (?, ?, ?)
-        """, (filename, resume_text, json.dumps(candidate_data)))
+        Args:
+            candidates: List of dictionaries with 'filename', 'resume_text',
+                'data' and optional 'content_hash', 'features' and 'vector'
+                
+        Returns:
+            List of inserted candidate IDs, in input order; None for a
+            candidate whose content_hash is already stored (it is not saved)
+        """
+        candidate_ids = []
+        skill_rows = []
         
-        candidate_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            for candidate in candidates:
+                features = candidate.get('features')
+                # The unique content hash index settles concurrent uploads of one file
+                cursor.execute("""
+                    INSERT INTO candidates (filename, resume_text, data, content_hash, features, vector)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (content_hash) WHERE content_hash IS NOT NULL DO NOTHING
+                """, (
+                    candidate['filename'],
+                    candidate['resume_text'],
+                    json.dumps(candidate['data']),
+                    candidate.get('content_hash'),
+                    json.dumps(features) if features is not None else None,
+                    candidate.get('vector')
+                ))
+                
+                if not cursor.rowcount:
+                    candidate_ids.append(None)
+                    continue
+                
+                candidate_id = cursor.lastrowid
+                candidate_ids.append(candidate_id)
+                skill_rows.extend(
+                    (candidate_id, skill)
+                    for skill in self._normalize_skills(candidate['data'].get('skills', []))
+                )
+            
+            # Index candidate skills for fast job matching
+            cursor.executemany("""
+                INSERT OR IGNORE INTO candidate_skills (candidate_id, skill)
+                VALUES (?, ?)
+            """, skill_rows)
+        
+        self.vectors.append({
+            candidate_id: candidate.get('vector')
+            for candidate_id, candidate in zip(candidate_ids, candidates)
+            if candidate_id is not None
+        })
         
-        return candidate_id
+        return candidate_ids
     
     def get_candidate(self, candidate_id):
         """
@@ -105,23 +502,54 @@ class DatabaseManager:
         Returns:
             Candidate data or None
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, filename, resume_text, data, created_at
+                FROM candidates
+                WHERE id = ?
+            """, (candidate_id,))
+            
+            row = cursor.fetchone()
         
-        cursor.execute("""
-            SELECT id, filename, resume_text, data, created_at
-            FROM candidates
-            WHERE id = ?
-        """, (candidate_id,))
+        if row:
+            return {
+                'id': row['id'],
+                'filename': row['filename'],
+                'resume_text': row['resume_text'],
+                'data': json.loads(row['data']),
+                'created_at': row['created_at']
+            }
+        return None
+    
+    def get_candidate_by_hash(self, content_hash):
+        """
+        Get candidate whose uploaded file has the given content hash
         
-        row = cursor.fetchone()
-        conn.close()
+        Args:
+            content_hash: SHA-256 hex digest of the uploaded file bytes
+            
+        Returns:
+            Candidate data or None
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, filename, data, created_at
+                FROM candidates
+                WHERE content_hash = ?
+                ORDER BY id
+                LIMIT 1
+            """, (content_hash,))
+            
+            row = cursor.fetchone()
         
         if row:
             return {
                 'id': row['id'],
                 'filename': row['filename'],
-                'resume_text': row['resume_text'],
                 'data': json.loads(row['data']),
                 'created_at': row['created_at']
             }
@@ -134,98 +562,714 @@ class DatabaseManager:
         Returns:
             List of candidate dictionaries
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, filename, resume_text, data, created_at
+                FROM candidates
+                ORDER BY created_at DESC
+            """)
+            
+            rows = cursor.fetchall()
         
-        cursor.execute("""
-            SELECT id, filename, resume_text, data, created_at
-            FROM candidates
-            ORDER BY created_at DESC
-        """)
+        candidates = []
+        for row in rows:
+            candidates.append({
+                'id': row['id'],
+                'filename': row['filename'],
+                'resume_text': row['resume_text'],
+                'data': json.loads(row['data']),
+                'created_at': row['created_at']
+            })
+        
+        return candidates
+    
+    def get_candidates_page(self, after_id=None, limit=100, fields=None):
+        """
+        Get one page of candidates, newest first, using keyset pagination
+        
+        Args:
+            after_id: Return candidates with an ID lower than this one
+                (the last ID of the previous page); None for the first page
+            limit: Maximum number of candidates to return
+            fields: Fields to return, from CANDIDATE_COLUMNS and
+                CANDIDATE_DATA_FIELDS; defaults to CANDIDATE_DEFAULT_FIELDS
+                
+        Returns:
+            Tuple of (list of candidate dictionaries containing only the
+            requested fields, after_id cursor for the next page or None)
+        """
+        fields = list(fields or self.CANDIDATE_DEFAULT_FIELDS)
+        unknown = [f for f in fields if f not in self.CANDIDATE_COLUMNS + self.CANDIDATE_DATA_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown candidate fields: {', '.join(unknown)}")
+        
+        # Only touch the columns asked for; data fields are read with json_extract
+        # so the full data blob is never decoded in Python
+        select = ['id AS _cursor_id']
+        for field in fields:
+            if field in self.CANDIDATE_COLUMNS:
+                select.append(field)
+            else:
+                select.append(f"json_extract(data, '$.{field}') AS {field}")
         
-        rows = cursor.fetchall()
-        conn.close()
+        # The first page starts above every ID, so every page is a primary key range
+        if after_id is None:
+            after_id = self.MAX_ROW_ID
+        # Fetch one extra row to know whether another page follows
+        params = [after_id, limit + 1]
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT {', '.join(select)}
+                FROM candidates
+                WHERE id < ?
+                ORDER BY id DESC
+                LIMIT ?
+            """, params)
+            
+            rows = cursor.fetchall()
+        
+        next_after_id = rows[limit - 1]['_cursor_id'] if len(rows) > limit else None
+        
+        candidates = []
+        for row in rows[:limit]:
+            candidate = {}
+            for field in fields:
+                value = row[field]
+                if value is not None and (field == 'data' or field in self.CANDIDATE_LIST_FIELDS):
+                    value = json.loads(value)
+                candidate[field] = value
+            candidates.append(candidate)
+        
+        return candidates, next_after_id
+    
+    def search_candidates(self, query, match_all=True, limit=20, offset=0):
+        """
+        Full-text search over resume text and skills, best matches first
+        
+        Args:
+            query: Search terms, e.g. 'kafka kubernetes' or '"machine learning"'
+            match_all: If True, candidates must mention every term;
+                otherwise any of them
+            limit: Maximum number of candidates to return
+            offset: Number of ranked candidates to skip
+            
+        Returns:
+            Tuple of (list of result dictionaries with BM25 relevance 'score'
+            and snippet, offset of the next page or None)
+        """
+        fts_query = self._fts_query(query, match_all)
+        if not fts_query:
+            raise ValueError("Search query is empty")
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Ordering by FTS5's own rank column lets FTS5 sort the matches
+            # itself, so snippets and joins only run for the returned page.
+            # Skill matches weigh more than mentions in the resume text, and
+            # one extra row tells whether another page follows
+            cursor.execute("""
+                SELECT
+                    c.id,
+                    c.filename,
+                    json_extract(c.data, '$.name') AS name,
+                    json_extract(c.data, '$.skills') AS skills,
+                    c.created_at,
+                    f.rank,
+                    snippet(candidates_fts, 0, '<mark>', '</mark>', '…', 16) AS snippet
+                FROM candidates_fts f
+                JOIN candidates c ON c.id = f.rowid
+                WHERE candidates_fts MATCH ? AND f.rank MATCH 'bm25(1.0, 5.0)'
+                ORDER BY f.rank
+                LIMIT ? OFFSET ?
+            """, (fts_query, limit + 1, offset))
+            
+            rows = cursor.fetchall()
+        
+        next_offset = offset + limit if len(rows) > limit else None
+        
+        results = []
+        for row in rows[:limit]:
+            results.append({
+                'id': row['id'],
+                'filename': row['filename'],
+                'name': row['name'],
+                'skills': json.loads(row['skills']) if row['skills'] else [],
+                'created_at': row['created_at'],
+                # FTS5 ranks are negated BM25 scores (lower is better); report
+                # a non-negative relevance, never -0.0
+                'score': round(max(0.0, -row['rank']), 4),
+                'snippet': row['snippet']
+            })
+        
+        return results, next_offset
+    
+    def count_candidates(self):
+        """
+        Count candidates in database
+        
+        Returns:
+            Number of stored candidates
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT COUNT(*) FROM candidates")
+            count = cursor.fetchone()[0]
+        
+        return count
+    
+    def get_indexed_skills(self):
+        """
+        Get the vocabulary of skills present in the skill index
+        
+        The vocabulary is kept in memory and only the skills of candidates
+        saved since the last call are read. Candidates are never updated
+        and their IDs are never reused, so the highest candidate ID tells
+        when the vocabulary changed, in this process or another one.
+        
+        Returns:
+            Frozenset of normalized (lowercase) skill names; the same object
+            is returned until the vocabulary changes
+        """
+        with self._skill_vocabulary_lock, self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM candidates")
+            max_id = cursor.fetchone()[0]
+            cached = self._skill_vocabulary
+            if cached is not None and cached[0] == max_id:
+                return cached[1]
+            
+            if cached is not None and 0 < cached[0] < max_id:
+                # Only the new candidates' skills, read by primary key
+                cursor.execute("SELECT data FROM candidates WHERE id > ?", (cached[0],))
+                new_skills = set()
+                for row in cursor.fetchall():
+                    new_skills.update(self._normalize_skills(json.loads(row['data']).get('skills', [])))
+                skills = cached[1] | new_skills if new_skills - cached[1] else cached[1]
+            else:
+                cursor.execute("SELECT DISTINCT skill FROM candidate_skills")
+                skills = frozenset(row['skill'] for row in cursor.fetchall())
+            
+            self._skill_vocabulary = (max_id, skills)
+        
+        return skills
+    
+    def get_match_candidates(self, skills=None, match_all=False, after_id=None, through_id=None):
+        """
+        Get candidates to score for a job, without their resume text
+        
+        Args:
+            skills: List of skill names to look up in the skill index;
+                None returns every candidate
+            match_all: If True, return only candidates having every skill
+                (intersection); otherwise any of them (union)
+            after_id: Only return candidates with a higher ID
+            through_id: Only return candidates with this ID or lower
+            
+        Returns:
+            List of candidate dictionaries with 'features' (None for
+            candidates saved before feature records existed)
+        """
+        # Candidate ID range, applied to the skill index lookup as well
+        id_conditions = []
+        id_params = []
+        if after_id is not None:
+            id_conditions.append("{column} > ?")
+            id_params.append(after_id)
+        if through_id is not None:
+            id_conditions.append("{column} <= ?")
+            id_params.append(through_id)
+        
+        conditions = [condition.format(column='id') for condition in id_conditions]
+        params = list(id_params)
+        if skills is not None:
+            skills = self._normalize_skills(skills)
+            if not skills:
+                return []
+            placeholders = ', '.join('?' for _ in skills)
+            having = f"HAVING COUNT(*) = {len(skills)}" if match_all else ""
+            skill_range = ''.join(
+                f" AND {condition.format(column='candidate_id')}" for condition in id_conditions
+            )
+            conditions.append(f"""
+                id IN (
+                    SELECT candidate_id
+                    FROM candidate_skills
+                    WHERE skill IN ({placeholders}){skill_range}
+                    GROUP BY candidate_id
+                    {having}
+                )
+            """)
+            params += skills + id_params
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT id, filename, data, features, created_at
+                FROM candidates
+                {where}
+                ORDER BY created_at DESC
+            """, params)
+            
+            rows = cursor.fetchall()
         
         candidates = []
         for row in rows:
             candidates.append({
                 'id': row['id'],
                 'filename': row['filename'],
-                'resume_text': row['resume_text'],
                 'data': json.loads(row['data']),
+                'features': json.loads(row['features']) if row['features'] else None,
                 'created_at': row['created_at']
             })
         
         return candidates
     
-    def save_job_matching(self, job_title, job_description, match_results):
+    def get_max_candidate_id(self):
+        """
+        Get the highest candidate ID (candidate IDs are never reused)
+        
+        Returns:
+            Highest candidate ID, or 0 when there are no candidates
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM candidates")
+            return cursor.fetchone()[0]
+    
+    def get_resume_texts(self, candidate_ids):
+        """
+        Get the resume text of several candidates
+        
+        Args:
+            candidate_ids: List of candidate IDs
+            
+        Returns:
+            Dictionary of candidate ID to resume text
+        """
+        texts = {}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(candidate_ids), 500):
+                batch = candidate_ids[start:start + 500]
+                placeholders = ', '.join('?' for _ in batch)
+                cursor.execute(
+                    f"SELECT id, resume_text FROM candidates WHERE id IN ({placeholders})",
+                    batch
+                )
+                texts.update((row['id'], row['resume_text']) for row in cursor.fetchall())
+        
+        return texts
+    
+    def save_candidate_features(self, features_by_id):
+        """
+        Store feature records for existing candidates
+        
+        Args:
+            features_by_id: Dictionary of candidate ID to feature record
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany(
+                "UPDATE candidates SET features = ? WHERE id = ?",
+                [(json.dumps(features), candidate_id) for candidate_id, features in features_by_id.items()]
+            )
+    
+    def save_candidate_vectors(self, vectors_by_id):
+        """
+        Store text vectors for existing candidates
+        
+        Args:
+            vectors_by_id: Dictionary of candidate ID to float32 vector bytes
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany(
+                "UPDATE candidates SET vector = ? WHERE id = ?",
+                [(vector, candidate_id) for candidate_id, vector in vectors_by_id.items()]
+            )
+        
+        self.vectors.append(vectors_by_id)
+    
+    def save_job_matching(self, job_title, job_description, match_results,
+                          threshold=None, profile_hash=None, profile=None,
+                          scored_through=None, match_all_skills=False, scoring=None):
         """
         Save job posting and match results
         
         Args:
             job_title: Title of the job
             job_description: Job description text
-            match_results: List of match result dictionaries
+            match_results: List of match result dictionaries for every
+                scored candidate
+            threshold: Minimum score for shortlisting
+            profile_hash: Content hash of the compiled job profile
+            profile: Compiled job profile to store with the posting
+            scored_through: Highest candidate ID considered for the job
+            match_all_skills: Whether candidates had to have every job skill
+            scoring: How the job was scored, a dictionary with 'match_mode',
+                'matcher', 'cascade_band' and 'cascade_top_n'
             
         Returns:
             ID of inserted job posting
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Save job posting
-        cursor.execute("""
-            INSERT INTO job_postings (job_title, job_description)
-            VALUES (?, ?)
-        """, (job_title, job_description))
+        scoring = scoring or {}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Save job posting
+            cursor.execute("""
+                INSERT INTO job_postings
+                (job_title, job_description, threshold, total_candidates, scored_candidates,
+                 profile_hash, profile, scored_through, match_all_skills,
+                 match_mode, matcher, cascade_band, cascade_top_n)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                job_title,
+                job_description,
+                threshold,
+                len(match_results),
+                len(match_results),
+                profile_hash,
+                json.dumps(profile) if profile is not None else None,
+                scored_through,
+                int(match_all_skills),
+                *(scoring.get(column) for column in self.JOB_SCORING_COLUMNS)
+            ))
+            
+            job_id = cursor.lastrowid
+            
+            # Save match results
+            self.save_match_results(job_id, match_results)
         
-        job_id = cursor.lastrowid
+        return job_id
+    
+    def save_match_results(self, job_id, match_results):
+        """
+        Save match results for a job posting in one batched insert
         
-        # Save match results
-        for result in match_results:
-            cursor.execute("""
+        Args:
+            job_id: ID of the job posting
+            match_results: List of match result dictionaries
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
                 INSERT INTO match_results 
                 (job_id, candidate_id, score, justification, match_data)
                 VALUES (?, ?, ?, ?, ?)
+            """, [
+                (
+                    job_id,
+                    result['candidate_id'],
+                    result['score'],
+                    result['justification'],
+                    json.dumps(result)
+                )
+                for result in match_results
+            ])
+    
+    def create_job_posting(self, job_title, job_description, threshold=None, total_candidates=None,
+                           match_all_skills=False, scoring=None):
+        """
+        Create a queued job posting for asynchronous matching
+        
+        The job is owned by the calling process, which runs it on its
+        background workers (see fail_interrupted_jobs).
+        
+        Args:
+            job_title: Title of the job
+            job_description: Job description text
+            threshold: Minimum score for shortlisting
+            total_candidates: Number of candidates to score
+            match_all_skills: Whether candidates must have every job skill
+            scoring: How the job is scored (see save_job_matching)
+            
+        Returns:
+            ID of inserted job posting
+        """
+        scoring = scoring or {}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO job_postings
+                (job_title, job_description, status, threshold, total_candidates, scored_candidates,
+                 match_all_skills, worker_pid, worker_identity, match_mode, matcher, cascade_band, cascade_top_n)
+                VALUES (?, ?, 'queued', ?, ?, 0, ?, ?, ?, ?, ?, ?, ?)
             """, (
-                job_id,
-                result['candidate_id'],
-                result['score'],
-                result['justification'],
-                json.dumps(result)
+                job_title, job_description, threshold, total_candidates, int(match_all_skills),
+                os.getpid(), self._process_identity(os.getpid()),
+                *(scoring.get(column) for column in self.JOB_SCORING_COLUMNS)
             ))
+            
+            return cursor.lastrowid
+    
+    def update_job_status(self, job_id, status=None, total_candidates=None,
+                          scored_candidates=None, error=None, scored_through=None):
+        """
+        Update progress of an asynchronous job
         
-        conn.commit()
-        conn.close()
+        Args:
+            job_id: ID of the job posting
+            status: New status (queued, running, completed, failed)
+            total_candidates: Number of candidates to score
+            scored_candidates: Number of candidates scored so far
+            error: Error message for failed jobs
+            scored_through: Highest candidate ID considered for the job
+        """
+        updates = {
+            'status': status,
+            'total_candidates': total_candidates,
+            'scored_candidates': scored_candidates,
+            'error': error,
+            'scored_through': scored_through
+        }
+        updates = {column: value for column, value in updates.items() if value is not None}
+        if not updates:
+            return
         
-        return job_id
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            assignments = ', '.join(f"{column} = ?" for column in updates)
+            cursor.execute(
+                f"UPDATE job_postings SET {assignments} WHERE id = ?",
+                list(updates.values()) + [job_id]
+            )
     
-    def get_job_history(self):
+    def fail_interrupted_jobs(self):
         """
-        Get job matching history
+        Mark queued and running jobs whose server process is gone as failed
+        
+        Jobs run on an in-process thread pool, so a job whose owning process
+        exited (restart, crash, deploy) would otherwise stay queued or running
+        forever. Jobs of other live processes are left alone.
         
         Returns:
-            List of job postings with match counts
+            List of IDs of the jobs marked as failed
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, worker_pid, worker_identity
+                FROM job_postings
+                WHERE status IN ('queued', 'running')
+            """)
+            job_ids = [
+                row['id'] for row in cursor.fetchall()
+                if not self._process_alive(row['worker_pid'], row['worker_identity'])
+            ]
+            
+            cursor.executemany("""
+                UPDATE job_postings
+                SET status = 'failed', error = 'Interrupted by a server restart; please run the match again'
+                WHERE id = ? AND status IN ('queued', 'running')
+            """, [(job_id,) for job_id in job_ids])
         
-        cursor.execute("""
-            SELECT 
-                jp.id,
-                jp.job_title,
-                jp.job_description,
-                jp.created_at,
-                COUNT(mr.id) as match_count,
-                AVG(mr.score) as avg_score
-            FROM job_postings jp
-            LEFT JOIN match_results mr ON jp.id = mr.job_id
-            GROUP BY jp.id
-            ORDER BY jp.created_at DESC
-        """)
+        return job_ids
+    
+    def get_rematch_jobs(self, job_id=None):
+        """
+        Get completed jobs with what they were scored against
         
-        rows = cursor.fetchall()
-        conn.close()
+        Args:
+            job_id: ID of one job posting; None returns every completed job
+            
+        Returns:
+            List of job dictionaries with 'scored_through' and 'scoring'
+            (see save_job_matching)
+        """
+        where = "WHERE id = ?" if job_id is not None else "WHERE status = 'completed'"
+        params = (job_id,) if job_id is not None else ()
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT id, job_title, job_description, status, threshold,
+                       match_all_skills, scored_through,
+                       match_mode, matcher, cascade_band, cascade_top_n
+                FROM job_postings
+                {where}
+                ORDER BY id
+            """, params)
+            
+            rows = cursor.fetchall()
+        
+        return [
+            {
+                'id': row['id'],
+                'job_title': row['job_title'],
+                'job_description': row['job_description'],
+                'status': row['status'],
+                'threshold': row['threshold'],
+                'match_all_skills': bool(row['match_all_skills']),
+                'scored_through': row['scored_through'] or 0,
+                'scoring': {column: row[column] for column in self.JOB_SCORING_COLUMNS}
+            }
+            for row in rows
+        ]
+    
+    def merge_match_results(self, job_id, match_results, previous_through, scored_through):
+        """
+        Add the scores of newly considered candidates to a job
+        
+        The job's candidate range and counts are advanced in the same
+        transaction, only if no other re-match advanced them first.
+        
+        Args:
+            job_id: ID of the job posting
+            match_results: List of match result dictionaries for the new candidates
+            previous_through: Highest candidate ID considered before
+            scored_through: Highest candidate ID considered now
+            
+        Returns:
+            True if merged, False if the job was already advanced
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                UPDATE job_postings
+                SET scored_through = ?,
+                    total_candidates = COALESCE(total_candidates, 0) + ?,
+                    scored_candidates = COALESCE(scored_candidates, 0) + ?
+                WHERE id = ? AND COALESCE(scored_through, 0) = ?
+            """, (scored_through, len(match_results), len(match_results), job_id, previous_through))
+            if not cursor.rowcount:
+                return False
+            
+            self.save_match_results(job_id, match_results)
+        
+        return True
+    
+    def save_job_profile(self, job_id, profile_hash, profile):
+        """
+        Store the compiled profile of a job posting
+        
+        Args:
+            job_id: ID of the job posting
+            profile_hash: Content hash of the compiled job profile
+            profile: Compiled job profile
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                "UPDATE job_postings SET profile_hash = ?, profile = ? WHERE id = ?",
+                (profile_hash, json.dumps(profile), job_id)
+            )
+    
+    def get_job_profile(self, profile_hash):
+        """
+        Get a compiled job profile stored with an earlier job posting
+        
+        Args:
+            profile_hash: Content hash of the compiled job profile
+            
+        Returns:
+            Profile dictionary or None
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT profile
+                FROM job_postings
+                WHERE profile_hash = ? AND profile IS NOT NULL
+                ORDER BY id DESC
+                LIMIT 1
+            """, (profile_hash,))
+            
+            row = cursor.fetchone()
+        
+        return json.loads(row['profile']) if row else None
+    
+    def get_job_status(self, job_id):
+        """
+        Get status and progress of a job posting
+        
+        Args:
+            job_id: ID of the job posting
+            
+        Returns:
+            Job status dictionary or None
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, job_title, status, threshold, total_candidates,
+                       scored_candidates, error, created_at
+                FROM job_postings
+                WHERE id = ?
+            """, (job_id,))
+            
+            row = cursor.fetchone()
+        
+        if row:
+            return {
+                'id': row['id'],
+                'job_title': row['job_title'],
+                'status': row['status'],
+                'threshold': row['threshold'],
+                'total_candidates': row['total_candidates'],
+                'scored_candidates': row['scored_candidates'],
+                'error': row['error'],
+                'created_at': row['created_at']
+            }
+        return None
+    
+    def get_job_history(self):
+        """
+        Get job matching history
+        
+        Returns:
+            List of job postings with shortlist counts at their threshold
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Jobs saved before all scores were stored have no threshold;
+            # every stored result of theirs was shortlisted. Jobs are read in
+            # created_at index order and each count is a (job_id, score)
+            # index range, so nothing is sorted or grouped
+            shortlisted = """
+                FROM match_results mr
+                WHERE mr.job_id = jp.id AND mr.score >= COALESCE(jp.threshold, 0)
+            """
+            cursor.execute(f"""
+                SELECT 
+                    jp.id,
+                    jp.job_title,
+                    jp.job_description,
+                    jp.created_at,
+                    jp.status,
+                    jp.threshold,
+                    (SELECT COUNT(*) {shortlisted}) as match_count,
+                    (SELECT AVG(mr.score) {shortlisted}) as avg_score
+                FROM job_postings jp
+                ORDER BY jp.created_at DESC
+            """)
+            
+            rows = cursor.fetchall()
         
         jobs = []
         for row in rows:
@@ -234,74 +1278,263 @@ class DatabaseManager:
                 'job_title': row['job_title'],
                 'job_description': row['job_description'],
                 'created_at': row['created_at'],
+                'status': row['status'],
+                'threshold': row['threshold'],
                 'match_count': row['match_count'],
                 'avg_score': round(row['avg_score'], 2) if row['avg_score'] else 0
             })
         
         return jobs
     
-    def get_job_matches(self, job_id):
+    def get_job_shortlist(self, job_id, threshold=None, limit=None):
         """
-        Get all matches for a specific job
+        Get the best stored results of a job, highest score first
+        
+        Reads the (job_id, score) index, so any threshold or top-K is a
+        query over stored scores instead of a new scoring run.
         
         Args:
             job_id: ID of the job posting
+            threshold: Minimum score (None = no minimum)
+            limit: Maximum number of results (None = all)
+            
+        Returns:
+            List of match result dictionaries
+        """
+        where = "WHERE job_id = ?"
+        params = [job_id]
+        if threshold is not None:
+            where += " AND score >= ?"
+            params.append(threshold)
+        params.append(limit if limit is not None else -1)
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT match_data
+                FROM match_results
+                {where}
+                ORDER BY score DESC, id
+                LIMIT ?
+            """, params)
+            
+            rows = cursor.fetchall()
+        
+        return [json.loads(row['match_data']) for row in rows]
+    
+    def get_job_matches(self, job_id, sort='score', descending=True, limit=None, offset=0):
+        """
+        Get the stored matches of a job, one page at a time
+        
+        The page is picked from the sort key alone (the (job_id, score)
+        index when sorting by score), then only its rows are joined with
+        the candidate columns shown. The candidate name is extracted in SQL,
+        so candidate data blobs are never decoded in Python.
+        
+        Args:
+            job_id: ID of the job posting
+            sort: Sort key, from JOB_MATCH_SORTS
+            descending: Sort in descending order
+            limit: Maximum number of matches (None = all)
+            offset: Number of matches to skip
             
         Returns:
             List of match results with candidate information
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        if sort not in self.JOB_MATCH_SORTS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        direction = 'DESC' if descending else 'ASC'
+        # Ties follow the sort direction so the index order can be used as is
+        order_by = f"{self.JOB_MATCH_SORTS[sort]} {direction}, mr.id {direction}"
+        # Candidate columns are only joined for the page unless sorted by one
+        page_join = "JOIN candidates c ON mr.candidate_id = c.id" if 'c.' in order_by else ""
         
-        cursor.execute("""
-            SELECT 
-                mr.id,
-                mr.score,
-                mr.justification,
-                mr.match_data,
-                mr.created_at,
-                c.id as candidate_id,
-                c.filename,
-                c.data as candidate_data
-            FROM match_results mr
-            JOIN candidates c ON mr.candidate_id = c.id
-            WHERE mr.job_id = ?
-            ORDER BY mr.score DESC
-        """, (job_id,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                WITH page AS (
+                    SELECT mr.id
+                    FROM match_results mr
+                    {page_join}
+                    WHERE mr.job_id = ?
+                    ORDER BY {order_by}
+                    LIMIT ? OFFSET ?
+                )
+                SELECT 
+                    mr.id,
+                    mr.score,
+                    mr.justification,
+                    mr.match_data,
+                    mr.created_at,
+                    mr.candidate_id,
+                    c.filename,
+                    COALESCE(json_extract(c.data, '$.name'), 'Unknown') as candidate_name
+                FROM page
+                JOIN match_results mr ON mr.id = page.id
+                LEFT JOIN candidates c ON mr.candidate_id = c.id
+                ORDER BY {order_by}
+            """, (job_id, limit if limit is not None else -1, offset))
+            
+            rows = cursor.fetchall()
         
         matches = []
         for row in rows:
-            match_data = json.loads(row['match_data'])
-            candidate_data = json.loads(row['candidate_data'])
-            
             matches.append({
                 'id': row['id'],
                 'candidate_id': row['candidate_id'],
                 'filename': row['filename'],
-                'candidate_name': candidate_data.get('name', 'Unknown'),
+                'candidate_name': row['candidate_name'],
                 'score': row['score'],
                 'justification': row['justification'],
-                'match_details': match_data,
+                'match_details': json.loads(row['match_data']),
                 'created_at': row['created_at']
             })
         
         return matches
     
+    def count_job_matches(self, job_id):
+        """
+        Get the number of stored matches of a job
+        
+        Args:
+            job_id: ID of the job posting
+            
+        Returns:
+            Number of match results
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT COUNT(*) FROM match_results WHERE job_id = ?", (job_id,))
+            return cursor.fetchone()[0]
+    
     def clear_all_data(self):
         """
         Clear all data from all tables
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM match_results")
+            cursor.execute("DELETE FROM job_postings")
+            cursor.execute("DELETE FROM candidate_skills")
+            cursor.execute("DELETE FROM candidates")
         
-        cursor.execute("DELETE FROM match_results")
-        cursor.execute("DELETE FROM job_postings")
-        cursor.execute("DELETE FROM candidates")
+        self.vectors.clear()
+        self._skill_vocabulary = None
+        print("✅ All data cleared from database")
+    
+    @staticmethod
+    def _add_missing_columns(cursor, table, columns):
+        """
+        Add columns missing from a table created by an older schema
         
-        conn.commit()
-        conn.close()
+        Args:
+            cursor: Database cursor
+            table: Table name
+            columns: Dictionary of column name to column definition
+        """
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row['name'] for row in cursor.fetchall()}
+        for column, definition in columns.items():
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    
+    @staticmethod
+    def _process_alive(pid, identity=None):
+        """
+        Check whether the process that created a job is still running
         
-        print("✅ All data cleared from database")
+        A PID alone is not enough: after a restart it can belong to an
+        unrelated process. When the job recorded its worker's identity (see
+        _process_identity), the running process must have the same one.
+        
+        Args:
+            pid: Process ID (None for jobs created before owners were recorded)
+            identity: Identity recorded with the job, or None
+            
+        Returns:
+            True if the process exists; always False for this process, which
+            has no jobs running when it checks, and on Windows, where the
+            single development server process owns every job
+        """
+        if not pid or pid == os.getpid() or os.name == 'nt':
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # Exists, but belongs to another user
+            pass
+        if identity:
+            current = DatabaseManager._process_identity(pid)
+            if current is not None and current != identity:
+                # The PID was reused by another process
+                return False
+        return True
+    
+    @staticmethod
+    def _process_identity(pid):
+        """
+        Identify one run of a process, which its reusable PID does not
+        
+        Args:
+            pid: Process ID
+            
+        Returns:
+            'boot ID:start time' read from /proc on Linux, or None where
+            /proc is not available
+        """
+        try:
+            with open('/proc/sys/kernel/random/boot_id', 'r') as file:
+                boot_id = file.read().strip()
+            with open(f'/proc/{pid}/stat', 'r') as file:
+                stat = file.read()
+        except OSError:
+            return None
+        # starttime is field 22; fields 3 onward follow the command name in parentheses
+        start_time = stat.rsplit(')', 1)[1].split()[19]
+        return f"{boot_id}:{start_time}"
+    
+    @staticmethod
+    def _fts_query(query, match_all=True):
+        """
+        Turn user search text into an FTS5 query
+        
+        Each word (or double-quoted phrase) becomes a quoted FTS5 phrase, so
+        punctuation such as 'node.js' or 'c++' never breaks the query syntax.
+        
+        Args:
+            query: Search text
+            match_all: Join terms with AND (True) or OR (False)
+            
+        Returns:
+            FTS5 query string ('' when there are no terms)
+        """
+        terms = [
+            phrase or word
+            for phrase, word in re.findall(r'"([^"]+)"|(\S+)', query or '')
+        ]
+        terms = [term.replace('"', '').strip() for term in terms]
+        phrases = [f'"{term}"' for term in terms if term]
+        return (' AND ' if match_all else ' OR ').join(phrases)
+    
+    @staticmethod
+    def _normalize_skills(skills):
+        """
+        Normalize skill names for the skill index
+        
+        Args:
+            skills: List of skill names
+            
+        Returns:
+            Sorted list of unique, lowercase, non-empty skill names
+        """
+        return sorted({
+            skill.strip().lower()
+            for skill in skills
+            if isinstance(skill, str) and skill.strip()
+        })
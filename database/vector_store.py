@@ -0,0 +1,270 @@
+"""
+Vector Store
+Append-only, memory-mapped file of candidate vectors with an id map, so
+matching scans vectors in place instead of decoding them from SQLite rows
+"""
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+
+class VectorStore:
+    """Keep float32 candidate vectors in a memory-mapped file"""
+    
+    # Vector file header: magic, vector dimensions, reserved
+    HEADER = struct.Struct('<8sII')
+    MAGIC = b'RSVECT01'
+    
+    def __init__(self, path, dim, chunk_rows=16384):
+        """
+        Initialize the store
+        
+        The vector file holds a header followed by one float32 row per
+        vector; '<path>.ids' holds the int64 candidate ID of each row. A
+        candidate stored twice is represented by its last row.
+        
+        Args:
+            path: Path to the vector file
+            dim: Number of dimensions per vector
+            chunk_rows: Rows multiplied per block when scanning
+        """
+        self.path = path
+        self.ids_path = f"{path}.ids"
+        self.lock_path = f"{path}.lock"
+        self.dim = dim
+        self.row_bytes = dim * 4
+        self.chunk_rows = chunk_rows
+        # (file state, vector rows, sorted unique ids, latest row of each id)
+        self._snapshot = None
+        self._write_lock = threading.Lock()
+        
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+    
+    @contextmanager
+    def _locked(self, exclusive):
+        """
+        Hold the store's file lock
+        
+        Writers take it exclusively; readers take it shared while mapping,
+        so they never see one file replaced without the other.
+        
+        Args:
+            exclusive: Take an exclusive (write) lock instead of a shared one
+        """
+        thread_lock = self._write_lock if exclusive else None
+        if thread_lock:
+            thread_lock.acquire()
+        try:
+            with open(self.lock_path, 'a+b') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                yield
+        finally:
+            if thread_lock:
+                thread_lock.release()
+    
+    def _file_state(self):
+        """Get the identity and size of both files (None if missing)"""
+        try:
+            vectors = os.stat(self.path)
+            ids = os.stat(self.ids_path)
+        except FileNotFoundError:
+            return None
+        return (vectors.st_ino, vectors.st_size, ids.st_ino, ids.st_size)
+    
+    def _read_dim(self):
+        """Get the dimensions recorded in the vector file header (None if unusable)"""
+        try:
+            with open(self.path, 'rb') as vector_file:
+                header = vector_file.read(self.HEADER.size)
+        except FileNotFoundError:
+            return None
+        if len(header) < self.HEADER.size:
+            return None
+        magic, dim, _ = self.HEADER.unpack(header)
+        return dim if magic == self.MAGIC else None
+    
+    def _row_count(self, state):
+        """Get the number of complete rows present in both files"""
+        _, vectors_size, _, ids_size = state
+        return max(0, min((vectors_size - self.HEADER.size) // self.row_bytes, ids_size // 8))
+    
+    def _refresh(self):
+        """
+        Map the current files, if they changed since the last call
+        
+        Returns:
+            Tuple of (vector rows, sorted unique ids, latest row of each id)
+        """
+        snapshot = self._snapshot
+        state = self._file_state()
+        if snapshot is not None and snapshot[0] == state:
+            return snapshot[1:]
+        
+        with self._locked(exclusive=False):
+            state = self._file_state()
+            rows = self._row_count(state) if state and self._read_dim() == self.dim else 0
+            if rows:
+                # Read-only shared mappings: every process uses the same page cache
+                vectors = np.memmap(self.path, dtype=np.float32, mode='r',
+                                    offset=self.HEADER.size, shape=(rows, self.dim))
+                row_ids = np.fromfile(self.ids_path, dtype=np.int64, count=rows)
+            else:
+                vectors = np.empty((0, self.dim), dtype=np.float32)
+                row_ids = np.empty(0, dtype=np.int64)
+        
+        # Later rows replace earlier rows of the same candidate
+        ids, first_from_end = np.unique(row_ids[::-1], return_index=True)
+        latest_rows = rows - 1 - first_from_end
+        
+        self._snapshot = (state, vectors, ids, latest_rows)
+        return self._snapshot[1:]
+    
+    def _write_files(self, rows=()):
+        """
+        Replace both files with new contents
+        
+        New files are written aside and renamed over the old ones, so
+        existing mappings keep reading the old contents safely.
+        
+        Args:
+            rows: Iterable of (candidate ID, float32 vector bytes) tuples;
+                vectors of another size are skipped
+        """
+        vectors_temp = f"{self.path}.tmp"
+        ids_temp = f"{self.ids_path}.tmp"
+        with open(vectors_temp, 'wb') as vector_file, open(ids_temp, 'wb') as ids_file:
+            vector_file.write(self.HEADER.pack(self.MAGIC, self.dim, 0))
+            for candidate_id, vector in rows:
+                if vector is not None and len(vector) == self.row_bytes:
+                    vector_file.write(vector)
+                    ids_file.write(struct.pack('<q', candidate_id))
+        os.replace(ids_temp, self.ids_path)
+        os.replace(vectors_temp, self.path)
+    
+    def append(self, vectors_by_id):
+        """
+        Append candidate vectors
+        
+        Args:
+            vectors_by_id: Dictionary of candidate ID to float32 vector bytes;
+                vectors of another size are skipped
+        """
+        vectors_by_id = {
+            candidate_id: vector for candidate_id, vector in vectors_by_id.items()
+            if vector is not None and len(vector) == self.row_bytes
+        }
+        if not vectors_by_id:
+            return
+        
+        with self._locked(exclusive=True):
+            state = self._file_state()
+            if state is None or self._read_dim() != self.dim:
+                self._write_files()
+            else:
+                # Drop a partial row left by an interrupted append
+                rows = self._row_count(state)
+                os.truncate(self.path, self.HEADER.size + rows * self.row_bytes)
+                os.truncate(self.ids_path, rows * 8)
+            
+            # Vectors first: a row is only visible once its ID is written
+            with open(self.path, 'ab') as vector_file:
+                vector_file.write(b''.join(vectors_by_id.values()))
+            with open(self.ids_path, 'ab') as ids_file:
+                ids_file.write(np.fromiter(vectors_by_id, dtype=np.int64).tobytes())
+    
+    def rebuild(self, rows):
+        """
+        Replace the store contents
+        
+        Args:
+            rows: Iterable of (candidate ID, float32 vector bytes) tuples,
+                streamed to disk; vectors of another size are skipped
+        """
+        with self._locked(exclusive=True):
+            self._write_files(rows)
+    
+    def clear(self):
+        """Remove all vectors"""
+        with self._locked(exclusive=True):
+            self._write_files()
+    
+    def count(self):
+        """Get the number of candidates with a stored vector"""
+        _, ids, _ = self._refresh()
+        return len(ids)
+    
+    def contains(self, candidate_ids):
+        """
+        Check which candidates have a stored vector
+        
+        Args:
+            candidate_ids: List of candidate IDs
+            
+        Returns:
+            Boolean NumPy array, in the same order as candidate_ids
+        """
+        _, ids, _ = self._refresh()
+        return self._locate(ids, candidate_ids)[1]
+    
+    def similarities(self, query, candidate_ids):
+        """
+        Compute dot products of stored vectors with a query vector
+        
+        Rows are scanned in chunks straight from the mapping; dense runs of
+        rows are multiplied in place without copying.
+        
+        Args:
+            query: float32 query vector of length dim
+            candidate_ids: List of candidate IDs
+            
+        Returns:
+            float32 NumPy array in the same order as candidate_ids (NaN for
+            candidates without a stored vector)
+        """
+        vectors, ids, latest_rows = self._refresh()
+        positions, found = self._locate(ids, candidate_ids)
+        
+        result = np.full(len(found), np.nan, dtype=np.float32)
+        rows = latest_rows[positions[found]]
+        order = np.argsort(rows, kind='stable')
+        rows = rows[order]
+        scores = np.empty(len(rows), dtype=np.float32)
+        
+        for start in range(0, len(rows), self.chunk_rows):
+            block_rows = rows[start:start + self.chunk_rows]
+            first, last = block_rows[0], block_rows[-1]
+            if last - first + 1 <= 2 * len(block_rows):
+                block_scores = (vectors[first:last + 1] @ query)[block_rows - first]
+            else:
+                block_scores = vectors[block_rows] @ query
+            scores[order[start:start + len(block_rows)]] = block_scores
+        
+        result[found] = scores
+        return result
+    
+    @staticmethod
+    def _locate(ids, candidate_ids):
+        """
+        Find candidate IDs in the sorted ID array
+        
+        Args:
+            ids: Sorted unique stored IDs
+            candidate_ids: List of candidate IDs
+            
+        Returns:
+            Tuple of (positions in ids, boolean found mask)
+        """
+        candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        if not len(ids):
+            return np.zeros(len(candidate_ids), dtype=np.int64), np.zeros(len(candidate_ids), dtype=bool)
+        positions = np.minimum(np.searchsorted(ids, candidate_ids), len(ids) - 1)
+        return positions, ids[positions] == candidate_ids
@@ -14,6 +14,10 @@ def reset_database():
         Path(db_path).unlink()
         print(f"✅ Deleted old database: {db_path}")
     
+    # Delete WAL journal files left next to it
+    for suffix in ('-wal', '-shm'):
+        Path(db_path + suffix).unlink(missing_ok=True)
+    
     # Recreate database
     from database.db_manager import DatabaseManager
     db = DatabaseManager()
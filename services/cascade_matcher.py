@@ -0,0 +1,106 @@
+"""
+Cascade Job Matcher
+Scores every candidate with the fast keyword heuristic and sends only the
+borderline band (and optionally the top-N) to the LLM matcher
+"""
+
+
+class CascadeMatcher:
+    """Combine a cheap heuristic matcher with an expensive LLM matcher"""
+    
+    def __init__(self, heuristic_matcher, llm_matcher, band=1.0, top_n=0):
+        """
+        Initialize the cascade
+        
+        Args:
+            heuristic_matcher: Fast matcher scoring the whole pool
+            llm_matcher: LLM matcher re-scoring the selected candidates
+            band: Heuristic scores within this distance of the threshold
+                are re-scored by the LLM
+            top_n: Also re-score the N best heuristic scores (0 = none)
+        """
+        self.heuristic_matcher = heuristic_matcher
+        self.llm_matcher = llm_matcher
+        self.band = band
+        self.top_n = top_n
+    
+    def select_for_llm(self, heuristic_results, threshold):
+        """
+        Pick the candidates whose heuristic score is not decisive
+        
+        Args:
+            heuristic_results: Heuristic match results, in candidate order
+            threshold: Minimum score for shortlisting
+            
+        Returns:
+            Sorted list of candidate indexes to re-score with the LLM
+        """
+        selected = {
+            index for index, result in enumerate(heuristic_results)
+            if abs(result['score'] - threshold) <= self.band
+        }
+        
+        if self.top_n:
+            ranked = sorted(
+                range(len(heuristic_results)),
+                key=lambda index: heuristic_results[index]['score'],
+                reverse=True
+            )
+            selected.update(ranked[:self.top_n])
+        
+        return sorted(selected)
+    
+    def match_candidates(self, candidates, job_description, job_title, threshold,
+                         heuristic_profile=None, get_llm_profile=None):
+        """
+        Match candidates, calling the LLM only where the heuristic is unsure
+        
+        Clear accepts and clear rejects keep their heuristic score; every
+        result is tagged with the 'scorer' that produced it. The statistics
+        count candidates sent to the LLM separately from the requests made,
+        since batching packs several candidates into one request.
+        
+        Args:
+            candidates: List of candidate dictionaries
+            job_description: Job description text
+            job_title: Title of the position
+            threshold: Minimum score for shortlisting
+            heuristic_profile: Job profile compiled by the heuristic matcher
+            get_llm_profile: Callable returning the LLM matcher's job profile,
+                only called when some candidate needs the LLM
+            
+        Returns:
+            Tuple of (match results in candidate order, cascade statistics)
+        """
+        results = self.heuristic_matcher.match_candidates(
+            candidates, job_description, job_title, heuristic_profile
+        )
+        for result in results:
+            result['scorer'] = 'heuristic'
+        
+        selected = self.select_for_llm(results, threshold)
+        usage = {'requests': 0, 'cache_hits': 0}
+        if selected:
+            llm_profile = get_llm_profile() if get_llm_profile else None
+            llm_results = self.llm_matcher.match_candidates(
+                [candidates[index] for index in selected],
+                job_description,
+                job_title,
+                llm_profile,
+                usage=usage
+            )
+            for index, llm_result in zip(selected, llm_results):
+                llm_result['scorer'] = 'llm'
+                llm_result['heuristic_score'] = results[index]['score']
+                results[index] = llm_result
+        
+        stats = {
+            'band': self.band,
+            'top_n': self.top_n,
+            'heuristic_scored': len(candidates),
+            'llm_candidates': len(selected),
+            'llm_candidates_saved': len(candidates) - len(selected),
+            'llm_requests': usage['requests'],
+            'llm_cache_hits': usage['cache_hits']
+        }
+        return results, stats
@@ -5,6 +5,12 @@ Uses LLM to extract structured data from resume text
 import json
 from openai import OpenAI
 from config import Config
+from services.llm_cache import get_llm_cache, cached_json_completion
+
+EXTRACTION_SYSTEM_PROMPT = (
+    "You are an expert HR assistant that extracts structured information from resumes. "
+    "Always respond with valid JSON only."
+)
 
 
 class DataExtractor:
@@ -13,8 +19,9 @@ class DataExtractor:
     def __init__(self):
         """Initialize with OpenAI configuration"""
         Config.validate()
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = OpenAI(api_key=Config.OPENAI_API_KEY, base_url=Config.OPENAI_BASE_URL)
         self.model = Config.OPENAI_MODEL
+        self.cache = get_llm_cache()
     
     def extract_candidate_info(self, resume_text):
         """
@@ -29,23 +36,15 @@ class DataExtractor:
         prompt = self._build_extraction_prompt(resume_text)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert HR assistant that extracts structured information from resumes. Always respond with valid JSON only."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
+            content = cached_json_completion(
+                self.client,
+                self.cache,
+                self.model,
+                EXTRACTION_SYSTEM_PROMPT,
+                prompt,
+                temperature=0.3
             )
-            
-            extracted_data = json.loads(response.choices[0].message.content)
+            extracted_data = json.loads(content)
             return self._validate_and_format(extracted_data)
             
         except Exception as e:
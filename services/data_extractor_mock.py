@@ -3,6 +3,17 @@ Mock Data Extractor Service (for demo without OpenAI credits)
 Simulates LLM extraction without actual API calls
 """
 import json
+import re
+from config import Config
+from services.skill_matcher import DEFAULT_SKILLS_FILE, SkillMatcher, load_skills
+
+# Compiled once at import
+EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+EXPERIENCE_PATTERN = re.compile(r'(\d+)\+?\s*years?\s*(of)?\s*(experience|exp)', re.IGNORECASE)
+
+# Skill keywords (common technical keywords), shared with the vector matcher
+SKILL_MATCHER = SkillMatcher(load_skills(Config.SKILLS_FILE or DEFAULT_SKILLS_FILE))
 
 
 class DataExtractor:
@@ -27,32 +38,19 @@ class DataExtractor:
         name = lines[0].strip() if lines else "Unknown Candidate"
         
         # Extract email
-        import re
-        email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', resume_text)
+        email_match = EMAIL_PATTERN.search(resume_text)
         email = email_match.group(0) if email_match else "Not specified"
         
         # Extract phone
-        phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', resume_text)
+        phone_match = PHONE_PATTERN.search(resume_text)
         phone = phone_match.group(0) if phone_match else "Not specified"
         
-        # Extract skills (common technical keywords)
-        skills_keywords = [
-            'Python', 'JavaScript', 'Java', 'C++', 'React', 'Angular', 'Vue', 'Node.js',
-            'Django', 'Flask', 'FastAPI', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP',
-            'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Git', 'CI/CD', 'Jenkins',
-            'TensorFlow', 'PyTorch', 'Machine Learning', 'Deep Learning', 'NLP', 'scikit-learn',
-            'Pandas', 'NumPy', 'HTML', 'CSS', 'TypeScript', 'GraphQL', 'REST', 'Microservices',
-            'Terraform', 'Ansible', 'Linux', 'Bash', 'API', 'Agile', 'Scrum'
-        ]
-        
-        skills = []
+        # Extract skills (whole-word keyword matches)
+        skills = SKILL_MATCHER.find(resume_text)
         resume_lower = resume_text.lower()
-        for skill in skills_keywords:
-            if skill.lower() in resume_lower:
-                skills.append(skill)
         
         # Extract experience years
-        exp_match = re.search(r'(\d+)\+?\s*years?\s*(of)?\s*(experience|exp)', resume_text, re.IGNORECASE)
+        exp_match = EXPERIENCE_PATTERN.search(resume_text)
         total_exp = int(exp_match.group(1)) if exp_match else 0
         
         # Build experience section
@@ -3,20 +3,111 @@ Job Matcher Service
 Uses LLM to match candidates with job descriptions and provide scoring
 """
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 from config import Config
+from services.llm_cache import get_llm_cache, cached_json_completion
+
+MATCHING_SYSTEM_PROMPT = """You are an expert HR recruiter and talent matcher. 
+Your task is to objectively evaluate how well a candidate matches a job description.
+Provide honest assessments with specific evidence from the resume.
+Always respond with valid JSON only."""
+
+JOB_PROFILE_SYSTEM_PROMPT = """You are an expert HR recruiter.
+Your task is to condense a job description into the requirements candidates are judged on.
+Always respond with valid JSON only."""
+
+SCORING_CRITERIA = """SCORING CRITERIA (1-10 scale):
+- 9-10: Exceptional fit - All key requirements met, strong relevant experience
+- 7-8: Strong fit - Most requirements met, good relevant experience
+- 5-6: Moderate fit - Some requirements met, partial relevant experience
+- 3-4: Weak fit - Few requirements met, limited relevant experience
+- 1-2: Poor fit - Very few or no requirements met"""
 
 
 class JobMatcher:
     """Match candidates with job descriptions using semantic analysis"""
     
-    def __init__(self):
-        """Initialize with OpenAI configuration"""
+    # Identifies the layout of profiles built by compile_job_profile
+    PROFILE_VERSION = 'llm-1'
+    # Resume text sent per candidate in batched prompts
+    BATCH_EXCERPT_CHARS = 1500
+    
+    def __init__(self, resume_texts=None):
+        """
+        Initialize with OpenAI configuration
+        
+        Args:
+            resume_texts: Callable returning a dictionary of candidate ID to
+                resume text for a list of IDs (e.g.
+                DatabaseManager.get_resume_texts), used for candidates
+                passed without 'resume_text'
+        """
         Config.validate()
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = OpenAI(api_key=Config.OPENAI_API_KEY, base_url=Config.OPENAI_BASE_URL)
         self.model = Config.OPENAI_MODEL
+        self.max_workers = max(1, Config.MATCH_MAX_WORKERS)
+        self.batch_size = max(1, Config.MATCH_BATCH_SIZE)
+        self.batch_token_budget = Config.MATCH_BATCH_TOKEN_BUDGET
+        self.cache = get_llm_cache()
+        self.resume_texts = resume_texts
+    
+    def compile_job_profile(self, job_description):
+        """
+        Condense a job description into the requirements used for matching
+        
+        The profile is sent with every candidate instead of the full job
+        description. If the request fails, the profile falls back to the
+        full description and is marked so it is not cached.
+        
+        Args:
+            job_description: Job description text
+            
+        Returns:
+            Profile dictionary
+        """
+        prompt = f"""
+Condense the following job description into the requirements a candidate is evaluated against.
+
+JOB DESCRIPTION:
+{job_description}
+
+Return a JSON object with this exact structure:
+
+{{
+  "summary": "One or two sentences describing the role",
+  "seniority": "JUNIOR | MID | SENIOR | LEAD",
+  "min_experience_years": 3,
+  "required_skills": ["Skill 1", "Skill 2"],
+  "preferred_skills": ["Skill 1", "Skill 2"],
+  "responsibilities": ["Responsibility 1", "Responsibility 2"],
+  "education": "Required education or null"
+}}
+
+Return ONLY valid JSON, no additional text.
+"""
+        
+        try:
+            content = cached_json_completion(
+                self.client,
+                self.cache,
+                self.model,
+                JOB_PROFILE_SYSTEM_PROMPT,
+                prompt,
+                temperature=0.0
+            )
+            profile = json.loads(content)
+            for field in ('required_skills', 'preferred_skills', 'responsibilities'):
+                if not isinstance(profile.get(field), list):
+                    profile[field] = []
+            return profile
+        
+        except Exception as e:
+            print(f"Error compiling job profile: {e}")
+            return {'job_description': job_description, 'fallback': True}
     
-    def match_candidate(self, candidate_data, resume_text, job_description, job_title):
+    def match_candidate(self, candidate_data, resume_text, job_description, job_title, profile=None,
+                        usage=None):
         """
         Match a candidate against a job description
         
@@ -25,52 +116,327 @@ class JobMatcher:
             resume_text: Full resume text
             job_description: Job description text
             job_title: Title of the position
+            profile: Compiled job profile (the full job description is sent
+                when not given, instead of compiling one for a single match)
+            usage: Optional dictionary counting LLM 'requests' and 'cache_hits'
             
         Returns:
             Dictionary with match score, justification, and detailed analysis
         """
+        if profile is None:
+            # One request: a profile only pays off across many candidates
+            profile = {'job_description': job_description, 'fallback': True}
+        
         prompt = self._build_matching_prompt(
             candidate_data,
             resume_text,
-            job_description,
+            profile,
             job_title
         )
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert HR recruiter and talent matcher. 
-                        Your task is to objectively evaluate how well a candidate matches a job description.
-                        Provide honest assessments with specific evidence from the resume.
-                        Always respond with valid JSON only."""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            content = cached_json_completion(
+                self.client,
+                self.cache,
+                self.model,
+                MATCHING_SYSTEM_PROMPT,
+                prompt,
                 temperature=0.5,
-                response_format={"type": "json_object"}
+                validate=self._check_match_response,
+                usage=usage
             )
-            
-            match_result = json.loads(response.choices[0].message.content)
+            match_result = json.loads(content)
             return self._validate_match_result(match_result)
+        
+        except Exception as e:
+            print(f"Error matching candidate: {e}")
+            return self._get_fallback_match_result()
+    
+    def match_candidates(self, candidates, job_description, job_title, profile=None, usage=None):
+        """
+        Match many candidates against a job description
+        
+        Requests are sent concurrently, at most Config.MATCH_MAX_WORKERS at a
+        time. A candidate whose request fails gets the fallback result.
+        
+        Args:
+            candidates: List of candidate dictionaries with 'data' and either
+                'resume_text' or an 'id' to load it with
+            job_description: Job description text
+            job_title: Title of the position
+            profile: Compiled job profile (compiled here when not given)
+            usage: Optional dictionary counting LLM 'requests' (one per
+                batch when batching) and 'cache_hits'
+            
+        Returns:
+            List of match result dictionaries, in the same order as candidates
+        """
+        results = [None] * len(candidates)
+        for index, result in self.iter_match_candidates(
+            candidates, job_description, job_title, profile, usage
+        ):
+            results[index] = result
+        return results
+    
+    def iter_match_candidates(self, candidates, job_description, job_title, profile=None, usage=None):
+        """
+        Match candidates and yield each result as soon as it is scored
+        
+        Requests run concurrently like match_candidates, so results arrive
+        in completion order rather than input order. Closing the generator
+        early cancels the requests that have not started. With
+        Config.MATCH_BATCH_SIZE above 1, candidates are packed into batched
+        requests (see _match_batch).
+        
+        Args:
+            candidates: List of candidate dictionaries with 'data' and either
+                'resume_text' or an 'id' to load it with
+            job_description: Job description text
+            job_title: Title of the position
+            profile: Compiled job profile (compiled here when not given)
+            usage: Optional dictionary counting LLM 'requests' and 'cache_hits'
+            
+        Yields:
+            Tuples of (candidate index, match result)
+        """
+        if profile is None:
+            profile = self.compile_job_profile(job_description)
+        candidates = self._with_resume_text(candidates)
+        
+        def match_group(indexes):
+            group = [candidates[index] for index in indexes]
+            if len(group) == 1:
+                return [self._match_one(group[0], job_description, job_title, profile, usage)]
+            return self._match_batch(group, job_description, job_title, profile, usage)
+        
+        groups = self._plan_batches(candidates, job_title, profile)
+        
+        workers = min(self.max_workers, len(groups))
+        if workers <= 1:
+            for indexes in groups:
+                yield from zip(indexes, match_group(indexes))
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                executor.submit(match_group, indexes): indexes
+                for indexes in groups
+            }
+            for future in as_completed(futures):
+                yield from zip(futures[future], future.result())
+        finally:
+            # If the consumer stops early (e.g. a streaming client disconnected),
+            # drop the requests not sent yet instead of paying for them
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _match_one(self, candidate, job_description, job_title, profile, usage=None):
+        """
+        Match a single candidate dictionary with its own request
+        
+        Args:
+            candidate: Candidate dictionary (see match_candidates)
+            job_description: Job description text
+            job_title: Title of the position
+            profile: Compiled job profile
+            usage: Optional dictionary counting LLM 'requests' and 'cache_hits'
             
+        Returns:
+            Match result dictionary (the fallback result on failure)
+        """
+        try:
+            return self.match_candidate(
+                candidate['data'],
+                candidate['resume_text'],
+                job_description,
+                job_title,
+                profile,
+                usage
+            )
         except Exception as e:
             print(f"Error matching candidate: {e}")
             return self._get_fallback_match_result()
     
-    def _build_matching_prompt(self, candidate_data, resume_text, job_description, job_title):
+    def _match_batch(self, batch, job_description, job_title, profile, usage=None):
+        """
+        Match several candidates with one request
+        
+        The job requirements and instructions are sent once for the whole
+        batch. A response without a 'results' array is rejected before it
+        reaches the cache. Each returned entry is validated with
+        _validate_match_result; candidates missing from the response (or the
+        whole batch, if the request fails) are retried one at a time.
+        
+        Args:
+            batch: List of candidate dictionaries (see match_candidates)
+            job_description: Job description text
+            job_title: Title of the position
+            profile: Compiled job profile
+            usage: Optional dictionary counting LLM 'requests' and 'cache_hits'
+            
+        Returns:
+            List of match result dictionaries, in the same order as batch
+        """
+        refs = [f"C{number}" for number in range(1, len(batch) + 1)]
+        prompt = self._build_batch_matching_prompt(batch, refs, profile, job_title)
+        
+        entries = []
+        try:
+            content = cached_json_completion(
+                self.client,
+                self.cache,
+                self.model,
+                MATCHING_SYSTEM_PROMPT,
+                prompt,
+                temperature=0.5,
+                validate=self._check_batch_response,
+                usage=usage
+            )
+            entries = json.loads(content)['results']
+        except Exception as e:
+            print(f"Error matching candidate batch: {e}")
+            entries = []
+        
+        # First well-formed entry per candidate reference
+        results_by_ref = {}
+        for entry in entries:
+            if not isinstance(entry, dict) or 'score' not in entry:
+                continue
+            ref = str(entry.pop('candidate', '')).strip()
+            if ref in refs and ref not in results_by_ref:
+                results_by_ref[ref] = self._validate_match_result(entry)
+        
+        return [
+            results_by_ref[ref] if ref in results_by_ref
+            else self._match_one(candidate, job_description, job_title, profile, usage)
+            for ref, candidate in zip(refs, batch)
+        ]
+    
+    @staticmethod
+    def _check_match_response(response):
+        """
+        Reject a single-candidate response that is not a match result
+        
+        Args:
+            response: Parsed match response
+        """
+        if not isinstance(response, dict):
+            raise ValueError("Response is not a JSON object")
+        try:
+            float(response['score'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Response has no numeric 'score'")
+    
+    @staticmethod
+    def _check_batch_response(response):
+        """
+        Reject a batch response that has no 'results' array
+        
+        Args:
+            response: Parsed batch response
+        """
+        if not isinstance(response, dict) or not isinstance(response.get('results'), list):
+            raise ValueError("Response has no 'results' array")
+    
+    def _plan_batches(self, candidates, job_title, profile):
+        """
+        Group candidates into requests
+        
+        Candidates are packed in order, up to Config.MATCH_BATCH_SIZE per
+        request and while the batch prompt stays within
+        Config.MATCH_BATCH_TOKEN_BUDGET (estimated tokens).
+        
+        Args:
+            candidates: List of candidate dictionaries
+            job_title: Title of the position
+            profile: Compiled job profile
+            
+        Returns:
+            List of candidate index lists, one per request
+        """
+        if self.batch_size <= 1:
+            return [[index] for index in range(len(candidates))]
+        
+        # Job requirements and instructions, sent once per batch
+        preamble_tokens = self._estimate_tokens(
+            self._build_batch_matching_prompt([], [], profile, job_title)
+        )
+        
+        groups = []
+        group = []
+        group_tokens = preamble_tokens
+        for index, candidate in enumerate(candidates):
+            tokens = self._estimate_tokens(self._format_batch_candidate(candidate, 'C00'))
+            if group and (len(group) >= self.batch_size or group_tokens + tokens > self.batch_token_budget):
+                groups.append(group)
+                group = []
+                group_tokens = preamble_tokens
+            group.append(index)
+            group_tokens += tokens
+        if group:
+            groups.append(group)
+        
+        return groups
+    
+    @staticmethod
+    def _estimate_tokens(text):
+        """Estimate the token count of a text (about 4 characters per token)"""
+        return len(text) // 4 + 1
+    
+    def _with_resume_text(self, candidates):
+        """
+        Load the resume text of candidates passed without it
+        
+        Only the candidates about to be sent to the LLM are loaded, in one
+        lookup, so callers never read resume text for the whole pool.
+        
+        Args:
+            candidates: List of candidate dictionaries
+            
+        Returns:
+            List of candidate dictionaries, each with 'resume_text'
+        """
+        missing = [candidate['id'] for candidate in candidates if 'resume_text' not in candidate]
+        if not missing or self.resume_texts is None:
+            return candidates
+        
+        texts = self.resume_texts(missing)
+        return [
+            candidate if 'resume_text' in candidate
+            else {**candidate, 'resume_text': texts.get(candidate['id'], '')}
+            for candidate in candidates
+        ]
+    
+    def _format_job_profile(self, profile):
+        """
+        Render a compiled job profile for the matching prompt
+        
+        Args:
+            profile: Compiled job profile
+            
+        Returns:
+            Job requirements text
+        """
+        if profile.get('fallback'):
+            return f"JOB DESCRIPTION:\n{profile['job_description']}"
+        
+        return f"""JOB REQUIREMENTS:
+Summary: {profile.get('summary', 'Not provided')}
+Seniority: {profile.get('seniority', 'Unknown')}
+Minimum Experience: {profile.get('min_experience_years', 'Unknown')} years
+Required Skills: {', '.join(profile.get('required_skills', []))}
+Preferred Skills: {', '.join(profile.get('preferred_skills', []))}
+Responsibilities: {'; '.join(profile.get('responsibilities', []))}
+Education: {profile.get('education') or 'Not specified'}"""
+    
+    def _build_matching_prompt(self, candidate_data, resume_text, profile, job_title):
         """
         Build the matching prompt for the LLM
         
         Args:
             candidate_data: Structured candidate data
             resume_text: Full resume text
-            job_description: Job description
+            profile: Compiled job profile
             job_title: Job title
             
         Returns:
@@ -81,8 +447,7 @@ Compare the following candidate with the job description and provide a comprehen
 
 JOB TITLE: {job_title}
 
-JOB DESCRIPTION:
-{job_description}
+{self._format_job_profile(profile)}
 
 CANDIDATE PROFILE:
 Name: {candidate_data.get('name', 'Unknown')}
@@ -116,16 +481,80 @@ Analyze the candidate's fit for this role and return a JSON object with this exa
   "recommendation": "STRONG_FIT | GOOD_FIT | MODERATE_FIT | WEAK_FIT"
 }}
 
-SCORING CRITERIA (1-10 scale):
-- 9-10: Exceptional fit - All key requirements met, strong relevant experience
-- 7-8: Strong fit - Most requirements met, good relevant experience
-- 5-6: Moderate fit - Some requirements met, partial relevant experience
-- 3-4: Weak fit - Few requirements met, limited relevant experience
-- 1-2: Poor fit - Very few or no requirements met
+{SCORING_CRITERIA}
 
 Be specific and reference actual skills, experiences, and qualifications from the resume.
 Consider: technical skills, years of experience, relevant domain knowledge, education, and cultural indicators.
 Return ONLY valid JSON, no additional text.
+"""
+    
+    def _format_batch_candidate(self, candidate, ref):
+        """
+        Render the compact profile of one candidate for a batched prompt
+        
+        Args:
+            candidate: Candidate dictionary (see match_candidates)
+            ref: Reference the response uses for this candidate
+            
+        Returns:
+            Candidate profile text
+        """
+        candidate_data = candidate['data']
+        return f"""CANDIDATE {ref}:
+Name: {candidate_data.get('name', 'Unknown')}
+Skills: {', '.join(candidate_data.get('skills', []))}
+Experience: {candidate_data.get('total_experience_years', 'Unknown')} years
+Summary: {candidate_data.get('summary', 'Not provided')}
+Resume excerpt:
+{candidate['resume_text'][:self.BATCH_EXCERPT_CHARS]}
+"""
+    
+    def _build_batch_matching_prompt(self, batch, refs, profile, job_title):
+        """
+        Build the matching prompt for several candidates
+        
+        Args:
+            batch: List of candidate dictionaries
+            refs: Reference of each candidate, in batch order
+            profile: Compiled job profile
+            job_title: Job title
+            
+        Returns:
+            Formatted prompt string
+        """
+        candidate_blocks = '\n'.join(
+            self._format_batch_candidate(candidate, ref) for candidate, ref in zip(batch, refs)
+        )
+        return f"""
+Compare each of the following candidates with the job and provide a match analysis for every candidate.
+Judge each candidate on their own merits, not relative to the others.
+
+JOB TITLE: {job_title}
+
+{self._format_job_profile(profile)}
+
+{candidate_blocks}
+YOUR TASK:
+Return a JSON object with one entry per candidate, in this exact structure:
+
+{{
+  "results": [
+    {{
+      "candidate": "C1",
+      "score": 7.5,
+      "justification": "2-3 sentences explaining the score, covering strengths and weaknesses",
+      "key_matches": ["Specific skill/experience match 1", "Specific skill/experience match 2"],
+      "gaps": ["Missing skill or experience 1"],
+      "strengths": ["Key strength 1", "Key strength 2"],
+      "recommendation": "STRONG_FIT | GOOD_FIT | MODERATE_FIT | WEAK_FIT"
+    }}
+  ]
+}}
+
+{SCORING_CRITERIA}
+
+Use the candidate references exactly as given. Reference actual skills and experience from each resume.
+Return ONLY valid JSON, no additional text.
 """
     
     def _validate_match_result(self, result):
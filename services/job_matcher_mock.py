@@ -3,16 +3,21 @@ Mock Job Matcher Service (for demo without OpenAI credits)
 Simulates LLM matching without actual API calls
 """
 import json
+import numpy as np
+from services.resume_features import ROLE_SKILLS
 
 
 class JobMatcher:
     """Match candidates with job descriptions using keyword matching"""
     
+    # Identifies the layout of profiles built by compile_job_profile
+    PROFILE_VERSION = 'keyword-1'
+    
     def __init__(self):
         """Initialize without OpenAI"""
         pass
     
-    def match_candidate(self, candidate_data, resume_text, job_description, job_title):
+    def match_candidate(self, candidate_data, resume_text, job_description, job_title, profile=None):
         """
         Match a candidate against a job description using keyword analysis
         
@@ -21,45 +26,62 @@ class JobMatcher:
             resume_text: Full resume text
             job_description: Job description text
             job_title: Title of the position
+            profile: Compiled job profile (compiled here when not given)
             
         Returns:
             Dictionary with match score, justification, and detailed analysis
         """
-        # Extract job requirements
-        job_lower = job_description.lower()
-        resume_lower = resume_text.lower()
+        candidate = {'data': candidate_data, 'resume_text': resume_text}
+        return self.match_candidates([candidate], job_description, job_title, profile)[0]
+    
+    def match_candidates(self, candidates, job_description, job_title, profile=None):
+        """
+        Match many candidates against a job description in one pass
         
-        # Common technical skills to check
-        required_skills = []
-        preferred_skills = []
+        All candidates are scored together from a candidate x skill
+        presence matrix against the compiled job profile.
         
-        # Identify job type
-        is_fullstack = any(word in job_lower for word in ['full stack', 'fullstack', 'full-stack'])
-        is_devops = any(word in job_lower for word in ['devops', 'sre', 'site reliability'])
-        is_data_science = any(word in job_lower for word in ['data scient', 'machine learning', 'ml engineer'])
+        Args:
+            candidates: List of candidate dictionaries with 'data' and either
+                'features' (see build_resume_features) or 'resume_text'
+            job_description: Job description text
+            job_title: Title of the position
+            profile: Compiled job profile (compiled here when not given)
+            
+        Returns:
+            List of match result dictionaries, in the same order as candidates
+        """
+        if not candidates:
+            return []
         
-        # Define skill sets for different roles
-        if is_fullstack:
-            required_skills = ['python', 'javascript', 'react', 'node', 'api', 'database']
-            preferred_skills = ['docker', 'aws', 'typescript', 'mongodb']
-        elif is_devops:
-            required_skills = ['aws', 'docker', 'kubernetes', 'terraform', 'ci/cd', 'linux']
-            preferred_skills = ['ansible', 'prometheus', 'jenkins', 'python']
-        elif is_data_science:
-            required_skills = ['python', 'machine learning', 'tensorflow', 'pytorch', 'pandas', 'numpy']
-            preferred_skills = ['nlp', 'deep learning', 'spark', 'sql']
-        else:
-            # Generic software role
-            required_skills = ['programming', 'software', 'development', 'git']
-            preferred_skills = ['cloud', 'database', 'api']
+        if profile is None:
+            profile = self.compile_job_profile(job_description)
+        required_skills = profile['required_skills']
+        preferred_skills = profile['preferred_skills']
+        skills = required_skills + preferred_skills
+        n_required = len(required_skills)
+        
+        # Candidate x skill presence matrix, read from the precomputed feature
+        # records (the resume text is only scanned for candidates without one)
+        presence = np.zeros((len(candidates), len(skills)), dtype=bool)
+        for row, candidate in enumerate(candidates):
+            features = candidate.get('features')
+            if features:
+                terms = set(features['terms'])
+                presence[row] = [skill in terms for skill in skills]
+            else:
+                resume_lower = candidate['resume_text'].lower()
+                presence[row] = [skill in resume_lower for skill in skills]
         
         # Calculate match score (much stricter)
-        required_matches = sum(1 for skill in required_skills if skill in resume_lower)
-        preferred_matches = sum(1 for skill in preferred_skills if skill in resume_lower)
+        required_matches = presence[:, :n_required].sum(axis=1)
+        preferred_matches = presence[:, n_required:].sum(axis=1)
         
         # Strict scoring: need most required skills to get high score
-        required_percentage = required_matches / len(required_skills) if required_skills else 0
-        preferred_percentage = preferred_matches / len(preferred_skills) if preferred_skills else 0
+        required_percentage = required_matches / n_required if n_required else np.zeros(len(candidates))
+        preferred_percentage = (
+            preferred_matches / len(preferred_skills) if preferred_skills else np.zeros(len(candidates))
+        )
         
         # Base score heavily weighted on required skills
         required_score = required_percentage * 6.5  # Max 6.5 from required
@@ -68,24 +90,130 @@ class JobMatcher:
         base_score = required_score + preferred_score
         
         # Experience adjustment (stricter)
-        exp_years = candidate_data.get('total_experience_years', 0)
-        if '5+' in job_lower or 'senior' in job_lower:
-            if exp_years >= 5:
-                base_score += 0.8
-            elif exp_years >= 3:
-                base_score += 0.3
-            else:
-                base_score -= 1.5  # Heavy penalty for junior on senior role
+        exp_years = np.array(
+            [candidate['data'].get('total_experience_years', 0) for candidate in candidates],
+            dtype=float
+        )
+        if profile['is_senior']:
+            base_score = base_score + np.select(
+                [exp_years >= 5, exp_years >= 3],
+                [0.8, 0.3],
+                default=-1.5  # Heavy penalty for junior on senior role
+            )
         
         # Penalize if very few matches
-        if required_percentage < 0.4:
-            base_score *= 0.7  # Reduce score by 30% if less than 40% match
+        base_score = np.where(required_percentage < 0.4, base_score * 0.7, base_score)
         
         # Cap score between 1 and 10, but more realistic distribution
-        final_score = min(9.5, max(1.0, base_score))
+        final_scores = np.minimum(9.5, np.maximum(1.0, base_score))
+        
+        job_lower = job_description.lower()
+        results = []
+        for row, candidate in enumerate(candidates):
+            results.append(self._build_match_result(
+                candidate['data'],
+                profile,
+                job_lower,
+                job_title,
+                # Round with Python semantics to match the per-candidate path
+                round(float(final_scores[row]), 1),
+                int(required_matches[row]),
+                presence[row, :n_required]
+            ))
+        
+        return results
+    
+    def iter_match_candidates(self, candidates, job_description, job_title, profile=None, chunk_size=32):
+        """
+        Match candidates and yield each result as soon as it is scored
+        
+        Candidates are scored in small batches, so the first results do not
+        wait for the whole pool.
+        
+        Args:
+            candidates: List of candidate dictionaries with 'data' and either
+                'features' (see build_resume_features) or 'resume_text'
+            job_description: Job description text
+            job_title: Title of the position
+            profile: Compiled job profile (compiled here when not given)
+            chunk_size: Number of candidates scored per batch
+            
+        Yields:
+            Tuples of (candidate index, match result)
+        """
+        if profile is None:
+            profile = self.compile_job_profile(job_description)
         
-        # Round to one decimal to look more realistic
-        final_score = round(final_score, 1)
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start:start + chunk_size]
+            for offset, result in enumerate(self.match_candidates(chunk, job_description, job_title, profile)):
+                yield start + offset, result
+    
+    def compile_job_profile(self, job_description):
+        """
+        Analyse a job description once for scoring
+        
+        The profile is plain JSON data, so it can be cached and stored
+        with the job posting and reused for every later match. It keeps
+        only the derived flags and skill lists, not the description itself.
+        
+        Args:
+            job_description: Job description text
+            
+        Returns:
+            Dictionary with role flags and skill lists
+        """
+        # Extract job requirements
+        job_lower = job_description.lower()
+        
+        # Common technical skills to check
+        required_skills = []
+        preferred_skills = []
+        
+        # Identify job type
+        is_fullstack = any(word in job_lower for word in ['full stack', 'fullstack', 'full-stack'])
+        is_devops = any(word in job_lower for word in ['devops', 'sre', 'site reliability'])
+        is_data_science = any(word in job_lower for word in ['data scient', 'machine learning', 'ml engineer'])
+        
+        # Pick the skill sets for the role
+        if is_fullstack:
+            required_skills, preferred_skills = ROLE_SKILLS['fullstack']
+        elif is_devops:
+            required_skills, preferred_skills = ROLE_SKILLS['devops']
+        elif is_data_science:
+            required_skills, preferred_skills = ROLE_SKILLS['data_science']
+        else:
+            # Generic software role
+            required_skills, preferred_skills = ROLE_SKILLS['generic']
+        
+        return {
+            'is_fullstack': is_fullstack,
+            'is_devops': is_devops,
+            'is_data_science': is_data_science,
+            'is_senior': '5+' in job_lower or 'senior' in job_lower,
+            'required_skills': required_skills,
+            'preferred_skills': preferred_skills
+        }
+    
+    def _build_match_result(self, candidate_data, profile, job_lower, job_title, final_score,
+                            required_matches, required_presence):
+        """
+        Build justification and detailed analysis for a scored candidate
+        
+        Args:
+            candidate_data: Structured candidate information
+            profile: Job profile from compile_job_profile
+            job_lower: Lowercased job description text
+            job_title: Title of the position
+            final_score: Final rounded score
+            required_matches: Number of required skills found in the resume
+            required_presence: Per required skill flags, True if found in the resume
+            
+        Returns:
+            Dictionary with match score, justification, and detailed analysis
+        """
+        required_skills = profile['required_skills']
+        exp_years = candidate_data.get('total_experience_years', 0)
         
         # Generate justification
         candidate_name = candidate_data.get('name', 'The candidate')
@@ -99,8 +227,8 @@ class JobMatcher:
         
         # Find missing skills
         gaps = []
-        for skill in required_skills:
-            if skill not in resume_lower:
+        for skill, present in zip(required_skills, required_presence):
+            if not present:
                 gaps.append(f"Limited {skill.capitalize()} experience mentioned")
         
         # Generate justification based on score
@@ -0,0 +1,239 @@
+"""
+Vector Job Matcher Service
+Ranks candidates by cosine similarity of hashed n-gram vectors, offline
+"""
+import base64
+import numpy as np
+from config import Config
+from services.data_extractor_mock import SKILL_MATCHER
+from services.text_vectorizer import vectorize
+
+
+class JobMatcher:
+    """Match candidates with job descriptions using stored text vectors"""
+    
+    # Identifies the layout of profiles built by compile_job_profile
+    PROFILE_VERSION = 'vector-1'
+    # Candidates need a stored vector (see ensure_vectors in app.py)
+    USES_VECTORS = True
+    # Cosine similarity mapped to the top score; resumes rarely exceed ~0.5
+    FULL_SCORE_SIMILARITY = 0.45
+    
+    def __init__(self, vector_store=None):
+        """
+        Initialize vector settings
+        
+        Args:
+            vector_store: VectorStore scanned for candidates with an 'id';
+                without it each candidate needs 'vector' or 'resume_text'
+        """
+        self.dim = Config.VECTOR_DIM
+        self.vector_store = vector_store
+    
+    def compile_job_profile(self, job_description):
+        """
+        Vectorize a job description once for scoring
+        
+        Args:
+            job_description: Job description text
+            
+        Returns:
+            Dictionary with the base64 float32 job vector and the skills
+            the description mentions
+        """
+        vector = vectorize(job_description, self.dim)
+        return {
+            'dim': self.dim,
+            'vector': base64.b64encode(vector.tobytes()).decode('ascii'),
+            'skills': SKILL_MATCHER.find(job_description)
+        }
+    
+    def match_candidate(self, candidate_data, resume_text, job_description, job_title, profile=None):
+        """
+        Match a candidate against a job description by vector similarity
+        
+        Args:
+            candidate_data: Structured candidate information
+            resume_text: Full resume text
+            job_description: Job description text
+            job_title: Title of the position
+            profile: Compiled job profile (compiled here when not given)
+            
+        Returns:
+            Dictionary with match score, justification, and detailed analysis
+        """
+        candidate = {'data': candidate_data, 'resume_text': resume_text}
+        return self.match_candidates([candidate], job_description, job_title, profile)[0]
+    
+    def match_candidates(self, candidates, job_description, job_title, profile=None):
+        """
+        Match many candidates against a job description
+        
+        Similarities come from matrix-vector products of the candidate
+        vectors with the job vector, read from the vector store in place.
+        
+        Args:
+            candidates: List of candidate dictionaries with 'data', an 'id'
+                in the vector store or else 'vector' (float32 bytes) or
+                'resume_text'
+            job_description: Job description text
+            job_title: Title of the position
+            profile: Compiled job profile (compiled here when not given)
+            
+        Returns:
+            List of match result dictionaries, in the same order as candidates
+        """
+        if not candidates:
+            return []
+        
+        profile = self._current_profile(job_description, profile)
+        similarities = self._similarities(candidates, profile)
+        return self._build_match_results(candidates, profile, job_title, similarities)
+    
+    def iter_match_candidates(self, candidates, job_description, job_title, profile=None, chunk_size=1024):
+        """
+        Match candidates and yield each result as soon as it is scored
+        
+        Similarities are computed in one scan; results are built per chunk.
+        
+        Args:
+            candidates: List of candidate dictionaries (see match_candidates)
+            job_description: Job description text
+            job_title: Title of the position
+            profile: Compiled job profile (compiled here when not given)
+            chunk_size: Number of results built per batch
+            
+        Yields:
+            Tuples of (candidate index, match result)
+        """
+        if not candidates:
+            return
+        
+        profile = self._current_profile(job_description, profile)
+        similarities = self._similarities(candidates, profile)
+        
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start:start + chunk_size]
+            results = self._build_match_results(
+                chunk, profile, job_title, similarities[start:start + chunk_size]
+            )
+            for offset, result in enumerate(results):
+                yield start + offset, result
+    
+    def _current_profile(self, job_description, profile):
+        """Get the job profile, rebuilding it if compiled under another VECTOR_DIM"""
+        if profile is None or profile.get('dim') != self.dim:
+            profile = self.compile_job_profile(job_description)
+        return profile
+    
+    def _similarities(self, candidates, profile):
+        """
+        Compute cosine similarities of candidates with the job vector
+        
+        Args:
+            candidates: List of candidate dictionaries (see match_candidates)
+            profile: Job profile from compile_job_profile
+            
+        Returns:
+            float32 NumPy array, in the same order as candidates
+        """
+        job_vector = np.frombuffer(base64.b64decode(profile['vector']), dtype=np.float32)
+        similarities = np.full(len(candidates), np.nan, dtype=np.float32)
+        
+        if self.vector_store is not None:
+            stored = [
+                index for index, candidate in enumerate(candidates)
+                if 'id' in candidate and 'vector' not in candidate
+            ]
+            if stored:
+                similarities[stored] = self.vector_store.similarities(
+                    job_vector, [candidates[index]['id'] for index in stored]
+                )
+        
+        # Candidates outside the store are vectorized from their text
+        missing = np.flatnonzero(np.isnan(similarities))
+        if len(missing):
+            matrix = np.frombuffer(
+                b''.join(self._candidate_vector(candidates[index]) for index in missing),
+                dtype=np.float32
+            ).reshape(len(missing), self.dim)
+            similarities[missing] = matrix @ job_vector
+        
+        return similarities
+    
+    def _build_match_results(self, candidates, profile, job_title, similarities):
+        """Build match results from similarities, in candidate order"""
+        scores = 1.0 + 9.0 * np.clip(similarities / self.FULL_SCORE_SIMILARITY, 0.0, 1.0)
+        
+        return [
+            self._build_match_result(candidate, profile, job_title, round(float(score), 1), float(similarity))
+            for candidate, score, similarity in zip(candidates, scores, similarities)
+        ]
+    
+    def _candidate_vector(self, candidate):
+        """Get a candidate's stored vector bytes, vectorizing its text if missing"""
+        vector = candidate.get('vector')
+        if vector is not None and len(vector) == self.dim * 4:
+            return vector
+        return vectorize(candidate['resume_text'], self.dim).tobytes()
+    
+    def _build_match_result(self, candidate, profile, job_title, final_score, similarity):
+        """
+        Build justification and detailed analysis for a scored candidate
+        
+        Args:
+            candidate: Candidate dictionary
+            profile: Job profile from compile_job_profile
+            job_title: Title of the position
+            final_score: Final rounded score
+            similarity: Cosine similarity with the job description
+            
+        Returns:
+            Dictionary with match score, justification, and detailed analysis
+        """
+        candidate_data = candidate['data']
+        candidate_name = candidate_data.get('name', 'The candidate')
+        exp_years = candidate_data.get('total_experience_years', 0)
+        
+        # Job skills found in the candidate's skills (or resume text, when given)
+        known = {skill.lower() for skill in candidate_data.get('skills', []) if isinstance(skill, str)}
+        if candidate.get('resume_text'):
+            known.update(skill.lower() for skill in SKILL_MATCHER.find(candidate['resume_text']))
+        
+        matched = [skill for skill in profile['skills'] if skill.lower() in known]
+        missing = [skill for skill in profile['skills'] if skill.lower() not in known]
+        
+        # Determine recommendation
+        if final_score >= 8:
+            recommendation = "STRONG_FIT"
+        elif final_score >= 6:
+            recommendation = "GOOD_FIT"
+        elif final_score >= 4:
+            recommendation = "MODERATE_FIT"
+        else:
+            recommendation = "WEAK_FIT"
+        
+        justification = (
+            f"{candidate_name}'s resume has a {similarity:.0%} textual similarity with the "
+            f"{job_title} description. "
+        )
+        if matched:
+            justification += f"It covers {len(matched)} of the {len(profile['skills'])} skills the job mentions. "
+        if missing:
+            justification += f"Not found in the resume: {', '.join(missing[:3])}. "
+        
+        strengths = []
+        if exp_years >= 5:
+            strengths.append(f"Extensive experience ({exp_years}+ years)")
+        if matched:
+            strengths.append(f"Covers {len(matched)} required technologies")
+        
+        return {
+            "score": final_score,
+            "justification": justification.strip(),
+            "key_matches": [f"Has {skill} experience" for skill in matched[:5]],
+            "gaps": [f"Limited {skill} experience mentioned" for skill in missing[:3]],
+            "strengths": strengths,
+            "recommendation": recommendation,
+            "similarity": round(similarity, 4)
+        }
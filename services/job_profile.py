@@ -0,0 +1,75 @@
+"""
+Job Profile Cache
+In-process LRU cache of compiled job description profiles
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def job_profile_key(job_description, version):
+    """
+    Build the content hash identifying a compiled job profile
+    
+    Args:
+        job_description: Job description text
+        version: Profile version of the matcher compiling it
+        
+    Returns:
+        Hex digest of the version and normalized description
+    """
+    payload = f"{version}\n{job_description.strip()}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class JobProfileCache:
+    """Keep the most recently used compiled job profiles in memory"""
+    
+    def __init__(self, max_entries=256):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries: Maximum number of profiles kept (0 = disabled)
+        """
+        self.max_entries = max_entries
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """
+        Look up a compiled profile
+        
+        Args:
+            key: Profile content hash
+            
+        Returns:
+            Profile dictionary or None
+        """
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+            return profile
+    
+    def put(self, key, profile):
+        """
+        Store a compiled profile, evicting the least recently used one
+        
+        Args:
+            key: Profile content hash
+            profile: Profile dictionary
+        """
+        if not self.max_entries:
+            return
+        
+        with self._lock:
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+    
+    def clear(self):
+        """Remove all cached profiles"""
+        with self._lock:
+            self._profiles.clear()
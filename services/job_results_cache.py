@@ -0,0 +1,87 @@
+"""
+Job Results Cache
+In-process LRU cache of pages read from a job's stored match results
+"""
+import threading
+from collections import OrderedDict
+
+
+class JobResultsCache:
+    """Keep recently read result pages of the most recently used jobs"""
+    
+    def __init__(self, max_jobs=128, max_pages=32):
+        """
+        Initialize the cache
+        
+        Args:
+            max_jobs: Maximum number of jobs with cached pages (0 = disabled)
+            max_pages: Maximum number of pages kept per job
+        """
+        self.max_jobs = max_jobs
+        self.max_pages = max_pages
+        # job_id -> (version, {query: page})
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, job_id, version, query):
+        """
+        Look up a cached page
+        
+        Args:
+            job_id: ID of the job posting
+            version: Current version of the job's results; pages cached
+                under another version are stale
+            query: Hashable description of the page (sort, order, limit, offset)
+            
+        Returns:
+            Cached page or None
+        """
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._jobs.move_to_end(job_id)
+            return entry[1].get(query)
+    
+    def put(self, job_id, version, query, page):
+        """
+        Store a page, evicting the least recently used job
+        
+        Args:
+            job_id: ID of the job posting
+            version: Version of the job's results the page was read at
+            query: Hashable description of the page
+            page: Page to cache
+        """
+        if not self.max_jobs:
+            return
+        
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None or entry[0] != version:
+                entry = (version, {})
+                self._jobs[job_id] = entry
+            pages = entry[1]
+            pages.pop(query, None)
+            pages[query] = page
+            while len(pages) > self.max_pages:
+                # Oldest page first
+                pages.pop(next(iter(pages)))
+            self._jobs.move_to_end(job_id)
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+    
+    def invalidate(self, job_id):
+        """
+        Drop every cached page of a job
+        
+        Args:
+            job_id: ID of the job posting
+        """
+        with self._lock:
+            self._jobs.pop(job_id, None)
+    
+    def clear(self):
+        """Remove all cached pages"""
+        with self._lock:
+            self._jobs.clear()
@@ -0,0 +1,299 @@
+"""
+LLM Response Cache
+Persistent on-disk cache for chat completion responses shared by the LLM services
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from config import Config
+
+
+class LLMCache:
+    """Cache LLM responses keyed by model, prompts and temperature"""
+    
+    # Seconds a hit may leave last_used stale, so most lookups write nothing
+    LAST_USED_RESOLUTION = 60
+    
+    def __init__(self, cache_path, max_entries=10000, max_bytes=100 * 1024 * 1024, ttl=0):
+        """
+        Initialize cache storage
+        
+        Args:
+            cache_path: Path to the SQLite cache file
+            max_entries: Maximum number of cached responses (0 = unlimited)
+            max_bytes: Maximum total size of cached responses (0 = unlimited)
+            ttl: Seconds before an entry expires (0 = never)
+        """
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # One pooled connection per thread (and per process, after fork)
+        self._local = threading.local()
+        
+        Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+    
+    def get_connection(self):
+        """
+        Get this thread's pooled cache database connection
+        
+        Connections are opened once per thread and process, in WAL mode so
+        lookups never wait for writers, and reused by every later call.
+        
+        Returns:
+            sqlite3 connection
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        
+        conn = sqlite3.connect(self.cache_path, timeout=30)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+    
+    def _init_db(self):
+        """Initialize cache schema"""
+        conn = self.get_connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)")
+        conn.commit()
+    
+    @staticmethod
+    def make_key(model, system_prompt, user_prompt, temperature):
+        """
+        Build the cache key for a request
+        
+        Args:
+            model: Model name
+            system_prompt: System message content
+            user_prompt: User message content
+            temperature: Sampling temperature
+        
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps([model, system_prompt, user_prompt, temperature])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, model, system_prompt, user_prompt, temperature):
+        """
+        Look up a cached response
+        
+        Args:
+            model: Model name
+            system_prompt: System message content
+            user_prompt: User message content
+            temperature: Sampling temperature
+        
+        Returns:
+            Cached response content or None
+        """
+        key = self.make_key(model, system_prompt, user_prompt, temperature)
+        now = time.time()
+        
+        conn = self.get_connection()
+        row = conn.execute(
+            "SELECT response, created_at, last_used FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        
+        if row and self.ttl and row[1] < now - self.ttl:
+            # Expired entry
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            conn.commit()
+            row = None
+        elif row and row[2] < now - self.LAST_USED_RESOLUTION:
+            # Eviction order only needs last_used to the nearest minute
+            conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+        
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        
+        return row[0] if row else None
+    
+    def set(self, model, system_prompt, user_prompt, temperature, response):
+        """
+        Store a response and evict least recently used entries over the limits
+        
+        Args:
+            model: Model name
+            system_prompt: System message content
+            user_prompt: User message content
+            temperature: Sampling temperature
+            response: Response content to cache
+        """
+        key = self.make_key(model, system_prompt, user_prompt, temperature)
+        now = time.time()
+        
+        conn = self.get_connection()
+        conn.execute("""
+            INSERT OR REPLACE INTO llm_cache (key, response, size, created_at, last_used)
+            VALUES (?, ?, ?, ?, ?)
+        """, (key, response, len(response.encode('utf-8')), now, now))
+        
+        if self.max_entries:
+            conn.execute("""
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache
+                    ORDER BY last_used DESC
+                    LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+        
+        if self.max_bytes:
+            conn.execute("""
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS total
+                        FROM llm_cache
+                    )
+                    WHERE total > ?
+                )
+            """, (self.max_bytes,))
+        
+        conn.commit()
+    
+    def stats(self):
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with hit/miss counters and current size
+        """
+        conn = self.get_connection()
+        entries, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            'entries': entries,
+            'bytes': total_bytes
+        }
+    
+    def clear(self):
+        """Remove all cached responses and reset counters"""
+        conn = self.get_connection()
+        conn.execute("DELETE FROM llm_cache")
+        conn.commit()
+        
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+_usage_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    Get the process-wide cache shared by the LLM services
+    
+    Returns:
+        LLMCache instance, or None when caching is disabled
+    """
+    global _shared_cache
+    
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMCache(
+                Config.LLM_CACHE_PATH,
+                max_entries=Config.LLM_CACHE_MAX_ENTRIES,
+                max_bytes=Config.LLM_CACHE_MAX_BYTES,
+                ttl=Config.LLM_CACHE_TTL
+            )
+    return _shared_cache
+
+
+def _count_usage(usage, key):
+    """Increment a counter of a caller's usage dictionary, if one was given"""
+    if usage is not None:
+        with _usage_lock:
+            usage[key] = usage.get(key, 0) + 1
+
+
+def cached_json_completion(client, cache, model, system_prompt, prompt, temperature,
+                           validate=None, usage=None):
+    """
+    Get a JSON chat completion, served from the cache when possible
+    
+    Args:
+        client: OpenAI client
+        cache: LLMCache instance or None
+        model: Model name
+        system_prompt: System message content
+        prompt: User message content
+        temperature: Sampling temperature
+        validate: Optional callable checking the parsed response; it raises
+            (e.g. ValueError) to reject the response, which is then not cached
+        usage: Optional dictionary whose 'requests' (sent to the API) and
+            'cache_hits' counters are incremented
+    
+    Returns:
+        Response content string
+    """
+    if cache:
+        cached = cache.get(model, system_prompt, prompt, temperature)
+        if cached is not None:
+            _count_usage(usage, 'cache_hits')
+            return cached
+    
+    _count_usage(usage, 'requests')
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        temperature=temperature,
+        response_format={"type": "json_object"}
+    )
+    content = response.choices[0].message.content
+    
+    # Only cache responses that parse as JSON (and pass validation)
+    parsed = json.loads(content)
+    if validate:
+        validate(parsed)
+    if cache:
+        cache.set(model, system_prompt, prompt, temperature, content)
+    
+    return content
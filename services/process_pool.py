@@ -0,0 +1,75 @@
+"""
+Process Pool
+Process pool created on first use and rebuilt after a worker crash
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class ProcessPool:
+    """Lazily created ProcessPoolExecutor that replaces itself once broken"""
+    
+    def __init__(self, max_workers=None, initializer=None, initargs=()):
+        """
+        Initialize pool settings (no processes are started yet)
+        
+        Args:
+            max_workers: Number of worker processes
+            initializer: Callable run in each new worker process
+            initargs: Arguments for the initializer
+        """
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def _get_executor(self):
+        """Get the current executor, starting a new one if needed"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=self.initializer,
+                    initargs=self.initargs
+                )
+            return self._executor
+    
+    def _discard(self, executor):
+        """Drop a broken executor so the next submit starts a new one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+    
+    def submit(self, fn, *args):
+        """
+        Run a callable in a worker process
+        
+        When a worker dies (OOM kill, crash in a native parser), every
+        pending task fails with BrokenProcessPool and the executor can no
+        longer be used; it is replaced on the next submit instead of
+        failing every later call.
+        
+        Args:
+            fn: Picklable callable
+            *args: Picklable arguments
+        
+        Returns:
+            Future of the result
+        """
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # Broken since its last task finished
+            self._discard(executor)
+            executor = self._get_executor()
+            future = executor.submit(fn, *args)
+        
+        def discard_if_broken(done):
+            if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+                self._discard(executor)
+        
+        future.add_done_callback(discard_if_broken)
+        return future
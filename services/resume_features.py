@@ -0,0 +1,81 @@
+"""
+Resume Features
+Builds the compact feature record stored with each candidate at upload time,
+so matching never needs to re-read or re-scan the full resume text
+"""
+import re
+
+# Bump when the record layout changes so stale records are rebuilt
+FEATURE_VERSION = 2
+
+# Skill sets checked by the keyword matcher for each kind of role
+ROLE_SKILLS = {
+    'fullstack': (
+        ['python', 'javascript', 'react', 'node', 'api', 'database'],
+        ['docker', 'aws', 'typescript', 'mongodb']
+    ),
+    'devops': (
+        ['aws', 'docker', 'kubernetes', 'terraform', 'ci/cd', 'linux'],
+        ['ansible', 'prometheus', 'jenkins', 'python']
+    ),
+    'data_science': (
+        ['python', 'machine learning', 'tensorflow', 'pytorch', 'pandas', 'numpy'],
+        ['nlp', 'deep learning', 'spark', 'sql']
+    ),
+    'generic': (
+        ['programming', 'software', 'development', 'git'],
+        ['cloud', 'database', 'api']
+    )
+}
+
+# Every term the keyword matcher looks for in resume text
+MATCH_TERMS = sorted({
+    term
+    for required, preferred in ROLE_SKILLS.values()
+    for term in required + preferred
+})
+
+# Section headings, on a line of their own
+SECTION_PATTERN = re.compile(
+    r'^[ \t]*(summary|profile|objective|experience|work experience|professional experience|'
+    r'employment|education|skills|technical skills|projects|certifications|languages)'
+    r'[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def build_resume_features(resume_text, candidate_data):
+    """
+    Build the feature record for a resume
+    
+    The record is read for every candidate on every match, so it only
+    holds what the matchers need and is much smaller than the resume.
+    Resume text for LLM prompts is read separately, and only for the
+    candidates sent to the LLM.
+    
+    Args:
+        resume_text: Full resume text
+        candidate_data: Structured candidate information
+        
+    Returns:
+        Dictionary with skills, experience, section offsets and the
+        matcher terms present in the text
+    """
+    resume_lower = resume_text.lower()
+    
+    sections = {}
+    for match in SECTION_PATTERN.finditer(resume_text):
+        # Keep the first occurrence of each heading
+        sections.setdefault(match.group(1).lower(), match.start(1))
+    
+    return {
+        'version': FEATURE_VERSION,
+        'skills': [
+            skill for skill in candidate_data.get('skills', [])
+            if isinstance(skill, str) and skill.strip()
+        ],
+        'experience_years': candidate_data.get('total_experience_years', 0),
+        'sections': sections,
+        # Substring checks of the keyword matcher, answered once at upload
+        'terms': [term for term in MATCH_TERMS if term in resume_lower]
+    }
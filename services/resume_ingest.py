@@ -0,0 +1,45 @@
+"""
+Resume Ingest Worker
+Parses and extracts resumes inside worker processes for bulk uploads
+"""
+from services.resume_parser import ResumeParser
+from services.resume_features import build_resume_features
+from services.text_vectorizer import vectorize
+
+# Per-process service instances, created by init_worker
+_parser = None
+_extractor = None
+
+
+def init_worker(extractor_class):
+    """
+    Initialize services in a worker process
+    
+    Args:
+        extractor_class: DataExtractor class to instantiate
+    """
+    global _parser, _extractor
+    # Files are already spread across processes; parse each one serially
+    _parser = ResumeParser(parallel=False)
+    _extractor = extractor_class()
+
+
+def parse_and_extract(data, ext):
+    """
+    Parse resume contents and extract structured candidate data
+    
+    Args:
+        data: File contents as bytes
+        ext: File extension ('pdf' or 'txt')
+        
+    Returns:
+        Tuple of (resume text, candidate data, feature record, vector bytes)
+    """
+    resume_text = _parser.parse_bytes(data, ext)
+    candidate_data = _extractor.extract_candidate_info(resume_text)
+    return (
+        resume_text,
+        candidate_data,
+        build_resume_features(resume_text, candidate_data),
+        vectorize(resume_text).tobytes()
+    )
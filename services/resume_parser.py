@@ -2,14 +2,102 @@
 Resume Parser Service
 Extracts text from PDF and TXT files
 """
+import io
+import os
+import tempfile
+from collections import deque
 import PyPDF2
 import pdfplumber
+from charset_normalizer import from_bytes
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from config import Config
+from services.process_pool import ProcessPool
+
+# Process pool for page-parallel PDF extraction, started on first use
+_page_pool = ProcessPool(max_workers=Config.PDF_PAGE_WORKERS)
+
+
+def _open_source(source):
+    """Get a path or fresh in-memory stream for a PDF given as a path or bytes"""
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _extract_page_range(source, start, end, max_chars):
+    """
+    Extract text from a range of PDF pages
+    
+    Each page is read with pdfplumber, falling back to PyPDF2 for that
+    page only when pdfplumber fails or finds no text.
+    
+    Args:
+        source: Path to PDF file or PDF bytes
+        start: First page index (inclusive)
+        end: Last page index (exclusive)
+        max_chars: Stop once this many characters are extracted (0 = no limit)
+        
+    Returns:
+        List of page texts, in page order
+    """
+    text_parts = []
+    total_chars = 0
+    fallback_reader = None
+    fallback_file = None
+    
+    try:
+        with pdfplumber.open(_open_source(source)) as pdf:
+            for index in range(start, min(end, len(pdf.pages))):
+                try:
+                    text = pdf.pages[index].extract_text()
+                except Exception as e:
+                    print(f"Error parsing PDF page {index + 1} with pdfplumber: {e}")
+                    text = None
+                
+                if not text:
+                    # Per-page fallback to PyPDF2
+                    try:
+                        if fallback_reader is None:
+                            if isinstance(source, bytes):
+                                fallback_file = io.BytesIO(source)
+                            else:
+                                fallback_file = open(source, 'rb')
+                            fallback_reader = PyPDF2.PdfReader(fallback_file)
+                        text = fallback_reader.pages[index].extract_text()
+                    except Exception as e:
+                        print(f"Error parsing PDF page {index + 1} with PyPDF2: {e}")
+                        text = None
+                
+                if text:
+                    text_parts.append(text)
+                    total_chars += len(text)
+                    if max_chars and total_chars >= max_chars:
+                        break
+    finally:
+        if fallback_file:
+            fallback_file.close()
+    
+    return text_parts
 
 
 class ResumeParser:
     """Parse resumes from PDF and text files"""
     
+    def __init__(self, parallel=None):
+        """
+        Initialize parser settings
+        
+        Args:
+            parallel: Extract large PDFs in worker processes; defaults to
+                Config.PDF_PARALLEL (off: the web server is already threaded,
+                and bulk uploads already parse in the ingest pool)
+        """
+        self.parallel = Config.PDF_PARALLEL if parallel is None else parallel
+        self.max_pages = Config.PDF_MAX_PAGES
+        self.max_chars = Config.PDF_MAX_CHARS
+        self.pages_per_worker = max(1, Config.PDF_PAGES_PER_WORKER)
+        self.page_workers = max(1, Config.PDF_PAGE_WORKERS)
+    
     def parse(self, filepath):
         """
         Parse resume file and extract text
@@ -29,58 +117,146 @@ class ResumeParser:
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
     
-    def _parse_pdf(self, filepath):
+    def parse_bytes(self, data, ext):
+        """
+        Parse resume contents already in memory and extract text
+        
+        Args:
+            data: File contents as bytes
+            ext: File extension ('pdf' or 'txt', with or without a leading dot)
+            
+        Returns:
+            Extracted text from resume
+        """
+        file_extension = '.' + ext.lower().lstrip('.')
+        
+        if file_extension == '.pdf':
+            return self._parse_pdf(data)
+        elif file_extension == '.txt':
+            return self._decode_text(data)
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+    
+    def _parse_pdf(self, source):
         """
-        Extract text from PDF using pdfplumber (primary) with PyPDF2 fallback
+        Extract text from PDF using pdfplumber (primary) with per-page PyPDF2 fallback
+        
+        At most Config.PDF_MAX_PAGES pages and Config.PDF_MAX_CHARS characters
+        are extracted. Documents longer than one worker's share of pages are
+        split into page ranges extracted in parallel worker processes (see
+        _extract_parallel).
         
         Args:
-            filepath: Path to PDF file
+            source: Path to PDF file or PDF bytes
             
         Returns:
             Extracted text
         """
         try:
-            # Try pdfplumber first (better for complex layouts)
-            with pdfplumber.open(filepath) as pdf:
-                text_parts = []
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-                
-                if text_parts:
-                    return '\n\n'.join(text_parts)
-            
-            # Fallback to PyPDF2 if pdfplumber fails
-            return self._parse_pdf_pypdf2(filepath)
-            
+            with pdfplumber.open(_open_source(source)) as pdf:
+                page_count = len(pdf.pages)
         except Exception as e:
             print(f"Error parsing PDF with pdfplumber: {e}")
             # Try PyPDF2 as fallback
-            return self._parse_pdf_pypdf2(filepath)
+            return self._parse_pdf_pypdf2(source)
+        
+        if self.max_pages:
+            page_count = min(page_count, self.max_pages)
+        
+        if self.parallel and page_count > self.pages_per_worker:
+            try:
+                text_parts = self._extract_parallel(source, page_count)
+            except BrokenProcessPool as e:
+                # A worker died; the pool is rebuilt on its next use
+                print(f"PDF page worker crashed, extracting serially: {e}")
+                text_parts = _extract_page_range(source, 0, page_count, self.max_chars)
+        else:
+            text_parts = _extract_page_range(source, 0, page_count, self.max_chars)
+        
+        text = '\n\n'.join(text_parts)
+        return text[:self.max_chars] if self.max_chars else text
+    
+    def _extract_parallel(self, source, page_count):
+        """
+        Extract page ranges in worker processes, in page order
+        
+        At most Config.PDF_PAGE_WORKERS ranges are in flight. Each range gets
+        the character budget left when it is submitted, and no more ranges
+        are submitted once the document's budget is spent. PDF bytes are
+        written to a temporary file once, so workers receive its path
+        instead of a pickled copy of the document.
+        
+        Args:
+            source: Path to PDF file or PDF bytes
+            page_count: Number of pages to extract
+            
+        Returns:
+            List of page texts, in page order
+        """
+        ranges = deque(
+            (start, min(start + self.pages_per_worker, page_count))
+            for start in range(0, page_count, self.pages_per_worker)
+        )
+        temp_path = None
+        if isinstance(source, bytes):
+            fd, temp_path = tempfile.mkstemp(suffix='.pdf')
+            with os.fdopen(fd, 'wb') as file:
+                file.write(source)
+        path = temp_path or source
+        
+        text_parts = []
+        total_chars = 0
+        pending = deque()
+        try:
+            while ranges or pending:
+                budget = self.max_chars - total_chars if self.max_chars else 0
+                while ranges and len(pending) < self.page_workers:
+                    start, end = ranges.popleft()
+                    pending.append(_page_pool.submit(_extract_page_range, path, start, end, budget))
+                
+                parts = pending.popleft().result()
+                text_parts.extend(parts)
+                total_chars += sum(len(text) for text in parts)
+                if self.max_chars and total_chars >= self.max_chars:
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+            if temp_path:
+                # Ranges still running read the file until they finish
+                wait(pending)
+                os.remove(temp_path)
+        
+        return text_parts
     
-    def _parse_pdf_pypdf2(self, filepath):
+    def _parse_pdf_pypdf2(self, source):
         """
         Fallback PDF parser using PyPDF2
         
         Args:
-            filepath: Path to PDF file
+            source: Path to PDF file or PDF bytes
             
         Returns:
             Extracted text
         """
         try:
-            with open(filepath, 'rb') as file:
+            file = io.BytesIO(source) if isinstance(source, bytes) else open(source, 'rb')
+            with file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 text_parts = []
+                total_chars = 0
                 
-                for page in pdf_reader.pages:
+                for page in pdf_reader.pages[:self.max_pages or None]:
                     text = page.extract_text()
                     if text:
                         text_parts.append(text)
+                        total_chars += len(text)
+                        if self.max_chars and total_chars >= self.max_chars:
+                            break
                 
-                return '\n\n'.join(text_parts)
-                
+                text = '\n\n'.join(text_parts)
+                return text[:self.max_chars] if self.max_chars else text
+        
         except Exception as e:
             raise Exception(f"Failed to parse PDF: {str(e)}")
     
@@ -94,10 +270,27 @@ class ResumeParser:
         Returns:
             File contents
         """
+        with open(filepath, 'rb') as file:
+            return self._decode_text(file.read())
+    
+    def _decode_text(self, data):
+        """
+        Decode text bytes, detecting non UTF-8 encodings with charset-normalizer
+        
+        Args:
+            data: Text file contents as bytes
+            
+        Returns:
+            Decoded text
+        """
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                return file.read()
+            # Most resumes are UTF-8 (or plain ASCII)
+            return data.decode('utf-8')
         except UnicodeDecodeError:
-            # Try different encoding
-            with open(filepath, 'r', encoding='latin-1') as file:
-                return file.read()
+            pass
+        
+        best = from_bytes(data).best()
+        if best is not None:
+            return str(best)
+        # Undetectable: latin-1 decodes any byte sequence
+        return data.decode('latin-1')
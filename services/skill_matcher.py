@@ -0,0 +1,99 @@
+"""
+Skill Matcher
+Finds skill keywords in text by looking them up in the text's set of words
+"""
+import re
+from pathlib import Path
+
+DEFAULT_SKILLS_FILE = Path(__file__).parent / 'data' / 'skills.txt'
+# Runs of letters and digits, the words skills are looked up by
+WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+def load_skills(path=DEFAULT_SKILLS_FILE):
+    """
+    Load skill keywords from a text file
+    
+    Args:
+        path: File with one skill per line ('#' starts a comment line)
+        
+    Returns:
+        List of skill names, in file order
+    """
+    skills = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            skill = line.strip()
+            if skill and not skill.startswith('#'):
+                skills.append(skill)
+    return skills
+
+
+class SkillMatcher:
+    """Match many skill keywords against the words of a text"""
+    
+    def __init__(self, skills):
+        """
+        Index the skills by their first word
+        
+        Args:
+            skills: List of skill names; matching is case-insensitive
+        """
+        self.skills = list(skills)
+        # Skills that are a single word, looked up in the text's word set
+        self._single_word = {}
+        # Other skills, checked in the text only when their first word occurs
+        self._by_first_word = {}
+        # Skills that do not start with a letter or digit, always checked
+        self._unanchored = []
+        
+        for index, skill in enumerate(self.skills):
+            lowered = skill.lower()
+            words = WORD_PATTERN.findall(lowered)
+            if words and words[0] == lowered:
+                self._single_word.setdefault(lowered, []).append(index)
+            elif words and lowered.startswith(words[0]):
+                self._by_first_word.setdefault(words[0], []).append((index, lowered))
+            elif lowered:
+                self._unanchored.append((index, lowered))
+    
+    def find(self, text):
+        """
+        Find skills mentioned in text as whole words
+        
+        A match only counts when it is not preceded or followed by a letter
+        or digit, so 'Java' does not match inside 'JavaScript'.
+        
+        Args:
+            text: Text to search
+            
+        Returns:
+            List of matched skill names, in skill list order
+        """
+        text = text.lower()
+        words = set(WORD_PATTERN.findall(text))
+        found = set()
+        
+        for word in words & self._single_word.keys():
+            found.update(self._single_word[word])
+        
+        candidates = [
+            skill for word in words & self._by_first_word.keys()
+            for skill in self._by_first_word[word]
+        ]
+        for index, lowered in candidates + self._unanchored:
+            if self._occurs(text, lowered):
+                found.add(index)
+        
+        return [self.skills[index] for index in sorted(found)]
+    
+    @staticmethod
+    def _occurs(text, skill):
+        """Check whether skill occurs in text with no letter or digit on either side"""
+        start = text.find(skill)
+        while start != -1:
+            end = start + len(skill)
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                return True
+            start = text.find(skill, start + 1)
+        return False
@@ -0,0 +1,74 @@
+"""
+Text Vectorizer
+Hashed word n-gram vectors for offline semantic matching (no model download)
+"""
+import re
+import zlib
+from collections import Counter
+import numpy as np
+from config import Config
+
+# Words, keeping inner and trailing '+', '#' and '.' (c++, c#, node.js)
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+
+# Common words that carry no matching signal
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can
+could did do does doing during each etc for from had has have having he her his
+how i if in into is it its just like may me more most must my no not of on one
+only or other our out over own per same she should so some such than that the
+their them then there these they this those through to too under until up very
+was we were what when where which while who whom why will with within would you
+your years year work working team teams experience strong using use used able
+including etc new role position candidate candidates job ability skills skill
+""".split())
+
+
+def tokenize(text):
+    """
+    Split text into lowercase word tokens, dropping stop words
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        List of tokens, in text order
+    """
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS and not token.isdigit()
+    ]
+
+
+def vectorize(text, dim=None):
+    """
+    Build the hashed n-gram vector of a text
+    
+    Word unigrams and bigrams are hashed (signed, CRC32) into a fixed number
+    of dimensions with sublinear term frequency, then L2-normalized, so the
+    dot product of two vectors is their cosine similarity.
+    
+    Args:
+        text: Input text
+        dim: Number of dimensions (defaults to Config.VECTOR_DIM)
+        
+    Returns:
+        float32 NumPy array of length dim
+    """
+    dim = dim or Config.VECTOR_DIM
+    tokens = tokenize(text)
+    grams = Counter(tokens)
+    grams.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    
+    vector = np.zeros(dim, dtype=np.float32)
+    for gram, count in grams.items():
+        digest = zlib.crc32(gram.encode('utf-8'))
+        # Low bits pick the dimension, the top bit the sign
+        sign = 1.0 if digest & 0x80000000 else -1.0
+        vector[digest % dim] += sign * (1.0 + np.log(count))
+    
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
@@ -41,6 +41,7 @@ def check_dependencies():
         import PyPDF2
         import pdfplumber
         import openai
+        import numpy
         print("✓ All dependencies installed")
         return True
     except ImportError as e:
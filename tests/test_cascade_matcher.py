@@ -0,0 +1,129 @@
+"""
+Tests for cascade matching against the local fake OpenAI-compatible server
+"""
+import unittest
+
+from services.cascade_matcher import CascadeMatcher
+from services.job_matcher_mock import JobMatcher as KeywordMatcher
+from tests.test_llm_matching import FakeServerTestCase
+
+
+# Resume text and the keyword score it gets for a generic developer job
+KEYWORD_RESUMES = {
+    'C0': ('', 1.0),
+    'C11': ('programming software', 3.2),
+    'C22': ('programming software development', 4.9),
+    'C33': ('programming software development git', 6.5),
+    'C44': ('programming software development git cloud', 7.2),
+    'C55': ('programming software development git cloud database api', 8.5),
+    'C66': ('git development software programming', 6.5)
+}
+
+
+class CascadeMatchingTest(FakeServerTestCase):
+    """CascadeMatcher with the keyword heuristic in front of the LLM matcher"""
+    
+    LATENCY = 0
+    THRESHOLD = 6.0
+    
+    def setUp(self):
+        super().setUp()
+        self.keyword_matcher = KeywordMatcher()
+        self.candidates = [
+            {'data': {'name': name}, 'resume_text': text}
+            for name, (text, _) in KEYWORD_RESUMES.items()
+        ]
+        self.profile_requests = 0
+    
+    def get_llm_profile(self):
+        self.profile_requests += 1
+        return self.profile
+    
+    def run_cascade(self, band=1.0, top_n=0):
+        cascade = CascadeMatcher(self.keyword_matcher, self.matcher, band=band, top_n=top_n)
+        return cascade.match_candidates(
+            self.candidates, 'Python developer', 'Developer', self.THRESHOLD,
+            get_llm_profile=self.get_llm_profile
+        )
+    
+    def test_keyword_scores(self):
+        results = self.keyword_matcher.match_candidates(self.candidates, 'Python developer', 'Developer')
+        
+        self.assertEqual(
+            [result['score'] for result in results],
+            [score for _, score in KEYWORD_RESUMES.values()]
+        )
+    
+    def test_band_selects_scores_near_threshold(self):
+        results, stats = self.run_cascade(band=1.0)
+        
+        self.assertEqual([result['scorer'] for result in results], [
+            'heuristic', 'heuristic', 'heuristic', 'llm', 'heuristic', 'heuristic', 'llm'
+        ])
+        # The LLM score replaces the heuristic one, which is kept alongside
+        self.assertEqual(results[3]['score'], 3)
+        self.assertEqual(results[3]['heuristic_score'], 6.5)
+        self.assertEqual(results[4]['score'], 7.2)
+        self.assertEqual(stats, {
+            'band': 1.0,
+            'top_n': 0,
+            'heuristic_scored': 7,
+            'llm_candidates': 2,
+            'llm_candidates_saved': 5,
+            'llm_requests': 2,
+            'llm_cache_hits': 0
+        })
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(self.profile_requests, 1)
+    
+    def test_top_n_adds_best_heuristic_scores(self):
+        results, stats = self.run_cascade(band=1.0, top_n=2)
+        
+        llm_names = [result['justification'] for result in results if result['scorer'] == 'llm']
+        self.assertEqual(llm_names, ['C33', 'C44', 'C55', 'C66'])
+        self.assertEqual(stats['llm_candidates'], 4)
+        self.assertEqual(stats['llm_candidates_saved'], 3)
+        self.assertEqual(stats['llm_requests'], 4)
+    
+    def test_select_for_llm_band_edges(self):
+        cascade = CascadeMatcher(self.keyword_matcher, self.matcher, band=0.5, top_n=1)
+        results = [{'score': score} for score in (5.4, 5.5, 6.5, 6.6, 9.0, 1.0)]
+        
+        # 5.5 and 6.5 are exactly on the band edges; 9.0 is the top-1
+        self.assertEqual(cascade.select_for_llm(results, self.THRESHOLD), [1, 2, 4])
+    
+    def test_no_llm_call_when_nothing_is_borderline(self):
+        results, stats = self.run_cascade(band=0.2)
+        
+        self.assertTrue(all(result['scorer'] == 'heuristic' for result in results))
+        self.assertEqual(stats['llm_candidates'], 0)
+        self.assertEqual(stats['llm_candidates_saved'], 7)
+        self.assertEqual(stats['llm_requests'], 0)
+        self.assertEqual(self.server.requests, 0)
+        self.assertEqual(self.profile_requests, 0)
+
+
+class BatchedCascadeMatchingTest(CascadeMatchingTest):
+    """Batching packs the selected candidates into fewer LLM requests"""
+    
+    BATCH_SIZE = 4
+    
+    def test_band_selects_scores_near_threshold(self):
+        _, stats = self.run_cascade(band=1.0)
+        
+        self.assertEqual(stats['llm_candidates'], 2)
+        self.assertEqual(stats['llm_requests'], 1)
+        self.assertEqual(self.server.requests, 1)
+    
+    def test_top_n_adds_best_heuristic_scores(self):
+        results, stats = self.run_cascade(band=1.0, top_n=2)
+        
+        llm_names = [result['justification'] for result in results if result['scorer'] == 'llm']
+        self.assertEqual(llm_names, ['C33', 'C44', 'C55', 'C66'])
+        self.assertEqual(stats['llm_candidates'], 4)
+        self.assertEqual(stats['llm_candidates_saved'], 3)
+        self.assertEqual(stats['llm_requests'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
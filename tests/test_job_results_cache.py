@@ -0,0 +1,79 @@
+"""
+Tests for the in-process cache of job result pages
+"""
+import unittest
+
+from services.job_results_cache import JobResultsCache
+
+
+class JobResultsCacheTest(unittest.TestCase):
+    """Pages are keyed by job and only served for the version they were read at"""
+    
+    QUERY = ('score', 'desc', 20, 0)
+    
+    def setUp(self):
+        self.cache = JobResultsCache(max_jobs=2, max_pages=2)
+    
+    def test_hit_for_same_version(self):
+        version = ('completed', 10, 10)
+        self.cache.put(1, version, self.QUERY, ['page'])
+        
+        self.assertEqual(self.cache.get(1, version, self.QUERY), ['page'])
+        self.assertIsNone(self.cache.get(1, version, ('score', 'desc', 20, 20)))
+        self.assertIsNone(self.cache.get(2, version, self.QUERY))
+    
+    def test_version_change_invalidates_pages(self):
+        version = ('processing', 10, 4)
+        self.cache.put(1, version, self.QUERY, ['partial'])
+        
+        # (status, total_candidates, scored_candidates)
+        changed_versions = [
+            ('processing', 10, 5),
+            ('processing', 11, 4),
+            ('completed', 10, 4)
+        ]
+        for changed in changed_versions:
+            with self.subTest(version=changed):
+                self.assertIsNone(self.cache.get(1, changed, self.QUERY))
+        
+        # Writing at a new version replaces every page of the old one
+        self.cache.put(1, ('completed', 10, 10), self.QUERY, ['final'])
+        self.assertIsNone(self.cache.get(1, version, self.QUERY))
+        self.assertEqual(self.cache.get(1, ('completed', 10, 10), self.QUERY), ['final'])
+    
+    def test_invalidate_and_clear(self):
+        version = ('completed', 3, 3)
+        self.cache.put(1, version, self.QUERY, ['one'])
+        self.cache.put(2, version, self.QUERY, ['two'])
+        
+        self.cache.invalidate(1)
+        self.assertIsNone(self.cache.get(1, version, self.QUERY))
+        self.assertEqual(self.cache.get(2, version, self.QUERY), ['two'])
+        
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(2, version, self.QUERY))
+    
+    def test_least_recently_used_job_and_oldest_page_are_evicted(self):
+        version = ('completed', 3, 3)
+        self.cache.put(1, version, self.QUERY, ['one'])
+        self.cache.put(2, version, self.QUERY, ['two'])
+        self.cache.get(1, version, self.QUERY)
+        self.cache.put(3, version, self.QUERY, ['three'])
+        
+        self.assertIsNone(self.cache.get(2, version, self.QUERY))
+        self.assertEqual(self.cache.get(1, version, self.QUERY), ['one'])
+        
+        for offset in (20, 40):
+            self.cache.put(1, version, ('score', 'desc', 20, offset), [offset])
+        self.assertIsNone(self.cache.get(1, version, self.QUERY))
+        self.assertEqual(self.cache.get(1, version, ('score', 'desc', 20, 40)), [40])
+    
+    def test_disabled_cache_stores_nothing(self):
+        cache = JobResultsCache(max_jobs=0)
+        cache.put(1, ('completed', 1, 1), self.QUERY, ['page'])
+        
+        self.assertIsNone(cache.get(1, ('completed', 1, 1), self.QUERY))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Regression tests for the vectorized keyword matcher
+"""
+import random
+import unittest
+
+from services.job_matcher_mock import JobMatcher
+from services.resume_features import build_resume_features
+
+
+def reference_score(candidate_data, resume_text, job_description):
+    """Score one candidate the way the original per-candidate loop did"""
+    job_lower = job_description.lower()
+    resume_lower = resume_text.lower()
+
+    is_fullstack = any(word in job_lower for word in ['full stack', 'fullstack', 'full-stack'])
+    is_devops = any(word in job_lower for word in ['devops', 'sre', 'site reliability'])
+    is_data_science = any(word in job_lower for word in ['data scient', 'machine learning', 'ml engineer'])
+
+    if is_fullstack:
+        required_skills = ['python', 'javascript', 'react', 'node', 'api', 'database']
+        preferred_skills = ['docker', 'aws', 'typescript', 'mongodb']
+    elif is_devops:
+        required_skills = ['aws', 'docker', 'kubernetes', 'terraform', 'ci/cd', 'linux']
+        preferred_skills = ['ansible', 'prometheus', 'jenkins', 'python']
+    elif is_data_science:
+        required_skills = ['python', 'machine learning', 'tensorflow', 'pytorch', 'pandas', 'numpy']
+        preferred_skills = ['nlp', 'deep learning', 'spark', 'sql']
+    else:
+        required_skills = ['programming', 'software', 'development', 'git']
+        preferred_skills = ['cloud', 'database', 'api']
+
+    required_matches = sum(1 for skill in required_skills if skill in resume_lower)
+    preferred_matches = sum(1 for skill in preferred_skills if skill in resume_lower)
+
+    required_percentage = required_matches / len(required_skills) if required_skills else 0
+    preferred_percentage = preferred_matches / len(preferred_skills) if preferred_skills else 0
+
+    base_score = required_percentage * 6.5 + preferred_percentage * 2.0
+
+    exp_years = candidate_data.get('total_experience_years', 0)
+    if '5+' in job_lower or 'senior' in job_lower:
+        if exp_years >= 5:
+            base_score += 0.8
+        elif exp_years >= 3:
+            base_score += 0.3
+        else:
+            base_score -= 1.5
+
+    if required_percentage < 0.4:
+        base_score *= 0.7
+
+    return round(min(9.5, max(1.0, base_score)), 1)
+
+
+class KeywordScoringRegressionTest(unittest.TestCase):
+    """JobMatcher.match_candidates scores like the original per-candidate loop"""
+    
+    # Role skills, near misses that only match as substrings, and noise
+    RESUME_WORDS = [
+        'Python', 'JavaScript', 'React', 'Node.js', 'API', 'database', 'Docker', 'AWS',
+        'TypeScript', 'MongoDB', 'Kubernetes', 'Terraform', 'CI/CD', 'Linux', 'Ansible',
+        'Prometheus', 'Jenkins', 'machine learning', 'TensorFlow', 'PyTorch', 'pandas',
+        'NumPy', 'NLP', 'deep learning', 'Spark', 'SQL', 'programming', 'software',
+        'development', 'Git', 'cloud', 'reactive', 'nodejs', 'gitlab', 'mysql', 'team', 'lead'
+    ]
+    JOB_WORDS = [
+        'full stack', 'Full-Stack', 'DevOps', 'SRE', 'site reliability', 'data scientist',
+        'machine learning', 'ML engineer', 'senior', '5+ years', 'engineer', 'team', 'remote'
+    ]
+    
+    def make_candidate(self, rng, with_features):
+        text = ' '.join(rng.choice(self.RESUME_WORDS) for _ in range(rng.randint(0, 25)))
+        data = {'name': 'Candidate', 'skills': [], 'total_experience_years': rng.randint(0, 10)}
+        candidate = {'data': data, 'resume_text': text}
+        if with_features:
+            candidate['features'] = build_resume_features(text, data)
+        return candidate
+    
+    def test_scores_match_per_candidate_loop(self):
+        rng = random.Random(2)
+        matcher = JobMatcher()
+        
+        for _ in range(60):
+            job_description = ' '.join(rng.choice(self.JOB_WORDS) for _ in range(rng.randint(1, 6)))
+            candidates = [self.make_candidate(rng, with_features=index % 2 == 0) for index in range(50)]
+            
+            results = matcher.match_candidates(candidates, job_description, 'Engineer')
+            
+            expected = [
+                reference_score(candidate['data'], candidate['resume_text'], job_description)
+                for candidate in candidates
+            ]
+            self.assertEqual([result['score'] for result in results], expected, job_description)
+
+
+if __name__ == '__main__':
+    unittest.main()
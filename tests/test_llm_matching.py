@@ -0,0 +1,263 @@
+"""
+Tests for concurrent LLM matching against a local fake OpenAI-compatible server
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from config import Config
+from services.job_matcher import JobMatcher
+from services.llm_cache import LLMCache
+
+
+class FakeOpenAIServer:
+    """Chat completions endpoint that answers slowly and tracks concurrency"""
+    
+    def __init__(self, latency=0.2):
+        """
+        Start the server on a free local port
+        
+        Args:
+            latency: Seconds each request takes
+        """
+        self.latency = latency
+        self.requests = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                server._enter()
+                try:
+                    time.sleep(server.latency)
+                finally:
+                    server._leave()
+                
+                # The candidate name decides the answer: FAIL -> error,
+                # NOSCORE -> a reply without a score, C<n> -> score n
+                prompt = body['messages'][-1]['content']
+                batch = re.findall(r'CANDIDATE (C\d+):\nName: (\S+)', prompt)
+                if batch:
+                    # A batch naming BADBATCH gets a reply without 'results'
+                    if any(name == 'BADBATCH' for _, name in batch):
+                        content = json.dumps({'nope': 1})
+                    else:
+                        content = json.dumps({'results': [
+                            {'candidate': ref, 'score': int(name[1:]) % 10, 'justification': name}
+                            for ref, name in batch
+                        ]})
+                    self._reply(body, content)
+                    return
+                name = re.search(r'Name: (\S+)', prompt).group(1)
+                if name in ('FAIL', 'BADBATCH'):
+                    self._send(400, {'error': {'message': 'rejected'}})
+                    return
+                if name == 'NOSCORE':
+                    self._reply(body, json.dumps({'justification': name}))
+                    return
+                self._reply(body, json.dumps({'score': int(name[1:]) % 10, 'justification': name}))
+            
+            def _reply(self, body, content):
+                self._send(200, {
+                    'id': 'chatcmpl-test',
+                    'object': 'chat.completion',
+                    'created': 0,
+                    'model': body['model'],
+                    'choices': [{
+                        'index': 0,
+                        'finish_reason': 'stop',
+                        'message': {'role': 'assistant', 'content': content}
+                    }],
+                    'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2}
+                })
+            
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+    
+    def _enter(self):
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+    
+    def _leave(self):
+        with self._lock:
+            self.active -= 1
+    
+    def stop(self):
+        """Shut the server down"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeServerTestCase(unittest.TestCase):
+    """Point a JobMatcher at a fresh FakeOpenAIServer"""
+    
+    MAX_WORKERS = 4
+    BATCH_SIZE = 1
+    LATENCY = 0.2
+    
+    def setUp(self):
+        self.server = FakeOpenAIServer(latency=self.LATENCY)
+        self.addCleanup(self.server.stop)
+        
+        patches = {
+            'OPENAI_API_KEY': 'test-key',
+            'OPENAI_BASE_URL': self.server.base_url,
+            'MATCH_MAX_WORKERS': self.MAX_WORKERS,
+            'MATCH_BATCH_SIZE': self.BATCH_SIZE,
+            'LLM_CACHE_ENABLED': False
+        }
+        for name, value in patches.items():
+            patcher = mock.patch.object(Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.matcher = JobMatcher()
+        self.matcher.client = self.matcher.client.with_options(max_retries=0)
+        self.profile = {'job_description': 'Python developer', 'fallback': True}
+    
+    def make_candidates(self, names):
+        return [{'data': {'name': name}, 'resume_text': f'Resume of {name}'} for name in names]
+
+
+class ConcurrentMatchingTest(FakeServerTestCase):
+    """JobMatcher.match_candidates with a bounded worker pool"""
+    
+    def test_results_follow_input_order(self):
+        names = [f'C{number}' for number in range(12)]
+        
+        results = self.matcher.match_candidates(
+            self.make_candidates(names), 'Python developer', 'Developer', self.profile
+        )
+        
+        self.assertEqual([result['justification'] for result in results], names)
+        self.assertEqual([result['score'] for result in results], [number % 10 for number in range(12)])
+    
+    def test_concurrency_is_bounded_by_max_workers(self):
+        candidates = self.make_candidates([f'C{number}' for number in range(12)])
+        
+        started = time.monotonic()
+        self.matcher.match_candidates(candidates, 'Python developer', 'Developer', self.profile)
+        elapsed = time.monotonic() - started
+        
+        self.assertEqual(self.server.requests, 12)
+        self.assertLessEqual(self.server.peak, self.MAX_WORKERS)
+        self.assertGreater(self.server.peak, 1)
+        # 12 requests of 0.2s on 4 workers, far below the 2.4s of sequential calls
+        self.assertLess(elapsed, 12 * self.server.latency * 0.75)
+    
+    def test_failed_request_gets_fallback_result(self):
+        names = ['C1', 'FAIL', 'C3']
+        
+        results = self.matcher.match_candidates(
+            self.make_candidates(names), 'Python developer', 'Developer', self.profile
+        )
+        
+        self.assertEqual(results[0]['justification'], 'C1')
+        self.assertEqual(results[1], self.matcher._get_fallback_match_result())
+        self.assertEqual(results[2]['justification'], 'C3')
+    
+    def test_closing_the_stream_cancels_pending_requests(self):
+        candidates = self.make_candidates([f'C{number}' for number in range(20)])
+        
+        stream = self.matcher.iter_match_candidates(
+            candidates, 'Python developer', 'Developer', self.profile
+        )
+        next(stream)
+        stream.close()
+        # Let the requests already in flight finish
+        time.sleep(self.server.latency * 2)
+        
+        # Only the first wave (and at most one more) was sent, not all 20
+        self.assertLessEqual(self.server.requests, 2 * self.MAX_WORKERS)
+
+
+class BatchMatchingTest(FakeServerTestCase):
+    """Batched requests, their usage counters and the response cache"""
+    
+    MAX_WORKERS = 1
+    BATCH_SIZE = 4
+    LATENCY = 0
+    
+    def setUp(self):
+        super().setUp()
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.matcher.cache = LLMCache(os.path.join(cache_dir.name, 'llm_cache.db'))
+    
+    def test_usage_counts_requests_not_candidates(self):
+        names = [f'C{number}' for number in range(8)]
+        
+        usage = {}
+        results = self.matcher.match_candidates(
+            self.make_candidates(names), 'Python developer', 'Developer', self.profile, usage=usage
+        )
+        
+        self.assertEqual([result['justification'] for result in results], names)
+        self.assertEqual(usage, {'requests': 2})
+        
+        usage = {}
+        self.matcher.match_candidates(
+            self.make_candidates(names), 'Python developer', 'Developer', self.profile, usage=usage
+        )
+        self.assertEqual(usage, {'cache_hits': 2})
+        self.assertEqual(self.server.requests, 2)
+    
+    def test_malformed_batch_response_is_not_cached(self):
+        names = ['C1', 'BADBATCH', 'C3']
+        
+        usage = {}
+        results = self.matcher.match_candidates(
+            self.make_candidates(names), 'Python developer', 'Developer', self.profile, usage=usage
+        )
+        # The batch reply is rejected and every candidate is retried alone
+        self.assertEqual(usage, {'requests': 4})
+        self.assertEqual(results[0]['justification'], 'C1')
+        self.assertEqual(results[1], self.matcher._get_fallback_match_result())
+        
+        usage = {}
+        self.matcher.match_candidates(
+            self.make_candidates(names), 'Python developer', 'Developer', self.profile, usage=usage
+        )
+        # The batch is sent again instead of replaying the bad reply;
+        # only the good single-candidate replies come from the cache
+        self.assertEqual(usage, {'requests': 2, 'cache_hits': 2})
+    
+    def test_malformed_single_response_is_not_cached(self):
+        names = ['NOSCORE']
+        
+        for _ in range(2):
+            usage = {}
+            results = self.matcher.match_candidates(
+                self.make_candidates(names), 'Python developer', 'Developer', self.profile, usage=usage
+            )
+            # Sent again every time instead of replaying the bad reply
+            self.assertEqual(usage, {'requests': 1})
+            self.assertEqual(results[0], self.matcher._get_fallback_match_result())
+
+
+if __name__ == '__main__':
+    unittest.main()
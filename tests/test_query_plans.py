@@ -0,0 +1,124 @@
+"""
+Tests that the main read queries use indexes instead of table scans,
+on a database upgraded from the original schema
+"""
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from config import Config
+from database.db_manager import DatabaseManager
+
+
+class QueryPlanTest(unittest.TestCase):
+    """EXPLAIN QUERY PLAN of DatabaseManager reads after migrating from schema version 1"""
+    
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        for name, value in {
+            'DATABASE_PATH': os.path.join(directory, 'resumes.db'),
+            'VECTOR_STORE_PATH': os.path.join(directory, 'vectors.f32')
+        }.items():
+            patcher = mock.patch.object(Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.db = DatabaseManager()
+        self.addCleanup(self.db.close_connection)
+        
+        # A database created by the original schema, with one candidate
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            self.db._migrate_to_1(cursor)
+            cursor.execute("""
+                INSERT INTO candidates (filename, resume_text, data)
+                VALUES ('old.txt', 'Python developer', '{"name": "Old", "skills": ["Python"]}')
+            """)
+            cursor.execute("PRAGMA user_version = 1")
+        
+        self.assertEqual(self.db.migrate(), DatabaseManager.SCHEMA_VERSION)
+        
+        self.candidate_id = self.db.save_candidate(
+            'new.txt', 'Go developer', {'name': 'New', 'skills': ['Go']}, content_hash='abc'
+        )
+        self.job_id = self.db.save_job_matching('Developer', 'Go and Python', [
+            {'candidate_id': 1, 'score': 4.0, 'justification': 'Some'},
+            {'candidate_id': self.candidate_id, 'score': 8.0, 'justification': 'Good'}
+        ], threshold=6.0)
+    
+    def query_plans(self, read):
+        """
+        Run a read and explain every SELECT it executed
+        
+        Args:
+            read: Callable performing the read
+            
+        Returns:
+            List of (SQL, plan detail lines) tuples
+        """
+        conn = self.db.get_connection()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            read()
+        finally:
+            conn.set_trace_callback(None)
+        
+        plans = []
+        for sql in statements:
+            if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                continue
+            details = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+            plans.append((sql, details))
+        self.assertTrue(plans, "The read executed no SELECT")
+        return plans
+    
+    def assertNoTableScan(self, read):
+        """Assert that no query of a read scans a whole table without an index"""
+        for sql, details in self.query_plans(read):
+            # Materialized CTEs (e.g. a page of IDs) are scanned by design
+            materialized = {
+                detail.split()[1] for detail in details if detail.startswith('MATERIALIZE ')
+            }
+            scans = [
+                detail for detail in details
+                if re.fullmatch(r'SCAN \S+', detail) and detail.split()[1] not in materialized
+            ]
+            self.assertEqual(scans, [], f"Table scan in:\n{' '.join(sql.split())}\n{details}")
+    
+    def test_candidate_listing(self):
+        self.assertNoTableScan(lambda: self.db.get_candidates_page(limit=10))
+        self.assertNoTableScan(lambda: self.db.get_candidates_page(after_id=self.candidate_id, limit=10))
+        self.assertNoTableScan(lambda: self.db.get_candidates_page(fields=['id', 'name', 'skills']))
+    
+    def test_job_matches(self):
+        for sort in DatabaseManager.JOB_MATCH_SORTS:
+            for descending in (True, False):
+                with self.subTest(sort=sort, descending=descending):
+                    self.assertNoTableScan(lambda: self.db.get_job_matches(
+                        self.job_id, sort=sort, descending=descending, limit=50, offset=10
+                    ))
+        self.assertNoTableScan(lambda: self.db.count_job_matches(self.job_id))
+    
+    def test_job_history(self):
+        self.assertNoTableScan(self.db.get_job_history)
+    
+    def test_job_shortlist(self):
+        self.assertNoTableScan(lambda: self.db.get_job_shortlist(self.job_id, threshold=6.0))
+        self.assertNoTableScan(lambda: self.db.get_job_shortlist(self.job_id, limit=10))
+        self.assertNoTableScan(lambda: self.db.get_job_status(self.job_id))
+    
+    def test_candidate_lookups(self):
+        self.assertNoTableScan(lambda: self.db.get_candidate(self.candidate_id))
+        self.assertNoTableScan(lambda: self.db.get_candidate_by_hash('abc'))
+        self.assertNoTableScan(lambda: self.db.get_resume_texts([1, self.candidate_id]))
+        self.assertNoTableScan(lambda: self.db.get_match_candidates(['python', 'go']))
+        self.assertNoTableScan(lambda: self.db.get_match_candidates(['python', 'go'], match_all=True))
+
+
+if __name__ == '__main__':
+    unittest.main()